@@ -3,8 +3,15 @@
 __version__ = "0.1.0"
 __author__ = "Venkat S. Malladi"
 
-from fairbio.registries import GA4GHServiceRegistry
-
 __all__ = [
     "GA4GHServiceRegistry"
 ]
+
+
+def __getattr__(name):
+    # Import registry clients on first access so that `import fairbio` (and
+    # every CLI entry point) does not pay for importing requests up front.
+    if name == "GA4GHServiceRegistry":
+        from fairbio.registries import GA4GHServiceRegistry
+        return GA4GHServiceRegistry
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
@@ -16,213 +16,314 @@ Usage:
 """
 
 import sys
-import json
 import argparse
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 
-from fairbio.registries.ga4gh_registry import GA4GHServiceRegistry
+from fairbio.utils.jsonparse import iter_json_items
+from fairbio.utils.output import save_output, save_output_raw
+
+# Timestamp recorded in every output document, computed once per run
+_RUN_TS = datetime.now(timezone.utc).isoformat()
+
+
+_logging_configured = False
 
 
 def setup_logging(verbose: bool = False):
-    """Configure logging."""
+    """Configure logging on the first call; later calls only adjust the level."""
+    global _logging_configured
     level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(message)s'
-    )
+    if not _logging_configured:
+        logging.basicConfig(
+            level=level,
+            format='%(message)s',
+            force=True
+        )
+        _logging_configured = True
+    else:
+        logging.getLogger().setLevel(level)
     return logging.getLogger(__name__)
 
 
-def save_output(data, output_file: str, format: str = "json"):
-    """Save output to file in specified format."""
-    if format == "json":
-        with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2)
-    elif format == "text":
-        with open(output_file, 'w') as f:
-            if isinstance(data, dict):
-                f.write(json.dumps(data, indent=2))
-            elif isinstance(data, list):
-                for item in data:
-                    if isinstance(item, dict):
-                        f.write(json.dumps(item) + "\n")
-                    else:
-                        f.write(str(item) + "\n")
-            else:
-                f.write(str(data))
+def get_registry(args):
+    """Create a registry client from the global CLI options."""
+    # Imported here so that --help and argument errors never load requests
+    from fairbio.registries.ga4gh_registry import GA4GHServiceRegistry
+    return GA4GHServiceRegistry(args.registry, cache=not args.no_cache,
+                                cache_ttl=args.cache_ttl, session=args.session)
 
 
 def cmd_list_services(args):
     """List all services or filter by type."""
-    logger = setup_logging(args.verbose)
+    logger = args.logger
     logger.info("🔍 Fetching services from GA4GH Service Registry...")
     
     try:
-        registry = GA4GHServiceRegistry(args.registry)
+        registry = get_registry(args)
+        
+        # An unfiltered JSON dump embeds the registry's response body as-is,
+        # so the service list is never re-encoded
+        passthrough = not args.type and args.output and args.format == "json"
         
         # Get all services
-        all_services = registry.get_services()
-        logger.info(f"✓ Found {len(all_services)} total services")
+        if passthrough:
+            raw_services = registry.get_services_raw()
+            # Count the services and keep only the ones shown in the summary,
+            # so no decoded copy of the whole list sits next to the raw body
+            services = []
+            total = 0
+            for service in iter_json_items((raw_services,)):
+                if total < 10:
+                    services.append(service)
+                total += 1
+        else:
+            services = registry.get_services()
+            total = len(services)
+        logger.info("✓ Found %d total services", total)
         
         # Filter by type if specified
         if args.type:
-            logger.info(f"🔎 Filtering by type: {args.type}")
-            filtered_services = registry.get_services_by_type(args.type)
-            logger.info(f"✓ Found {len(filtered_services)} services of type '{args.type}'")
-            services = filtered_services
-        else:
-            services = all_services
-        
-        # Prepare output
-        output = {
-            "timestamp": datetime.now().isoformat(),
-            "total_services": len(services),
-            "filter_type": args.type if args.type else None,
-            "services": services
-        }
+            logger.info("🔎 Filtering by type: %s", args.type)
+            services = registry.get_services_by_type(args.type, services=services)
+            total = len(services)
+            logger.info("✓ Found %d services of type '%s'", total, args.type)
         
-        # Save to file if specified
+        # Build the output document only when it is saved
+        output = None
         if args.output:
-            save_output(output, args.output, args.format)
-            logger.info(f"💾 Saved to {args.output}")
+            output = {
+                "timestamp": _RUN_TS,
+                "total_services": total,
+                "filter_type": args.type if args.type else None,
+                "services": services
+            }
+            if passthrough:
+                save_output_raw(output, "services", raw_services, args.output)
+            else:
+                save_output(output, args.output, args.format)
+            logger.info("💾 Saved to %s", args.output)
         
         # Print summary
-        logger.info("\n📋 Services Summary:")
-        for i, service in enumerate(services[:10], 1):  # Show first 10
-            logger.info(f"  {i}. {service.get('id', 'Unknown')} - {service.get('name', 'N/A')}")
-        if len(services) > 10:
-            logger.info(f"  ... and {len(services) - 10} more")
+        if logger.isEnabledFor(logging.INFO):
+            get = dict.get
+            rows = [(get(service, 'id', 'Unknown'), get(service, 'name', 'N/A'))
+                    for service in islice(services, 10)]  # Show first 10
+            lines = ["\n📋 Services Summary:"]
+            lines.extend("  %d. %s - %s" % (i, service_id, name)
+                         for i, (service_id, name) in enumerate(rows, 1))
+            if total > 10:
+                lines.append("  ... and %d more" % (total - 10))
+            logger.info("\n".join(lines))
         
         return output
         
     except Exception as e:
-        logger.error(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         sys.exit(1)
 
 
 def cmd_get_service(args):
     """Get a specific service by ID."""
-    logger = setup_logging(args.verbose)
+    logger = args.logger
     
     if not args.id:
         logger.error("❌ Service ID is required (use --id)")
         sys.exit(1)
     
-    logger.info(f"🔍 Fetching service: {args.id}")
+    logger.info("🔍 Fetching service: %s", args.id)
     
     try:
-        registry = GA4GHServiceRegistry(args.registry)
+        registry = get_registry(args)
         service = registry.get_service_by_id(args.id)
         
         if not service:
-            logger.error(f"❌ Service not found: {args.id}")
+            logger.error("❌ Service not found: %s", args.id)
             sys.exit(1)
         
-        logger.info(f"✓ Found service: {service.get('name', args.id)}")
+        logger.info("✓ Found service: %s", service.get('name', args.id))
         
-        output = {
-            "timestamp": datetime.now().isoformat(),
-            "service": service
-        }
-        
-        # Save to file if specified
+        # Build the output document only when it is saved
+        output = None
         if args.output:
+            output = {
+                "timestamp": _RUN_TS,
+                "service": service
+            }
             save_output(output, args.output, args.format)
-            logger.info(f"💾 Saved to {args.output}")
+            logger.info("💾 Saved to %s", args.output)
         
         # Print details
-        logger.info("\n📋 Service Details:")
-        logger.info(f"  ID: {service.get('id', 'N/A')}")
-        logger.info(f"  Name: {service.get('name', 'N/A')}")
-        logger.info(f"  URL: {service.get('url', 'N/A')}")
-        logger.info(f"  Description: {service.get('description', 'N/A')}")
+        logger.info(
+            "\n📋 Service Details:\n  ID: %s\n  Name: %s\n  URL: %s\n  Description: %s",
+            service.get('id', 'N/A'), service.get('name', 'N/A'),
+            service.get('url', 'N/A'), service.get('description', 'N/A'))
         
         return output
         
     except Exception as e:
-        logger.error(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         sys.exit(1)
 
 
 def cmd_list_types(args):
     """List all service types."""
-    logger = setup_logging(args.verbose)
+    logger = args.logger
     logger.info("🔍 Fetching service types from GA4GH Service Registry...")
     
     try:
-        registry = GA4GHServiceRegistry(args.registry)
+        registry = get_registry(args)
         service_types = registry.get_service_types()
         
-        logger.info(f"✓ Found {len(service_types)} service types")
-        
-        output = {
-            "timestamp": datetime.now().isoformat(),
-            "total_types": len(service_types),
-            "service_types": service_types
-        }
+        logger.info("✓ Found %d service types", len(service_types))
         
-        # Save to file if specified
+        # Build the output document only when it is saved
+        output = None
         if args.output:
+            output = {
+                "timestamp": _RUN_TS,
+                "total_types": len(service_types),
+                "service_types": service_types
+            }
             save_output(output, args.output, args.format)
-            logger.info(f"💾 Saved to {args.output}")
+            logger.info("💾 Saved to %s", args.output)
         
         # Print types
-        logger.info("\n📋 Service Types:")
-        for i, svc_type in enumerate(service_types, 1):
-            group = svc_type.get('group', 'N/A')
-            artifact = svc_type.get('artifact', 'N/A')
-            version = svc_type.get('version', 'N/A')
-            logger.info(f"  {i}. {artifact} (v{version}) - {group}")
+        if logger.isEnabledFor(logging.INFO):
+            # Extract fields in one pass, then format in a second tight loop
+            get = dict.get
+            rows = [(get(svc_type, 'artifact', 'N/A'), get(svc_type, 'version', 'N/A'),
+                     get(svc_type, 'group', 'N/A'))
+                    for svc_type in service_types]
+            lines = ["\n📋 Service Types:"]
+            lines.extend("  %d. %s (v%s) - %s" % (i, artifact, version, group)
+                         for i, (artifact, version, group) in enumerate(rows, 1))
+            logger.info("\n".join(lines))
         
         return output
         
     except Exception as e:
-        logger.error(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         sys.exit(1)
 
 
 def cmd_registry_info(args):
     """Get information about the registry itself."""
-    logger = setup_logging(args.verbose)
+    logger = args.logger
     logger.info("🔍 Fetching registry information...")
     
     try:
-        registry = GA4GHServiceRegistry(args.registry)
+        registry = get_registry(args)
         registry_info = registry.get_service_info()
         
         if not registry_info:
             logger.error("❌ Could not retrieve registry information")
             sys.exit(1)
         
-        logger.info(f"✓ Retrieved registry info")
-        
-        output = {
-            "timestamp": datetime.now().isoformat(),
-            "registry_info": registry_info
-        }
+        logger.info("✓ Retrieved registry info")
         
-        # Save to file if specified
+        # Build the output document only when it is saved
+        output = None
         if args.output:
+            output = {
+                "timestamp": _RUN_TS,
+                "registry_info": registry_info
+            }
             save_output(output, args.output, args.format)
-            logger.info(f"💾 Saved to {args.output}")
+            logger.info("💾 Saved to %s", args.output)
         
         # Print info
-        logger.info("\n📋 Registry Information:")
-        logger.info(f"  ID: {registry_info.get('id', 'N/A')}")
-        logger.info(f"  Name: {registry_info.get('name', 'N/A')}")
-        logger.info(f"  URL: {registry_info.get('url', 'N/A')}")
-        logger.info(f"  Organization: {registry_info.get('organization', {}).get('name', 'N/A')}")
-        logger.info(f"  Description: {registry_info.get('description', 'N/A')}")
+        logger.info(
+            "\n📋 Registry Information:\n  ID: %s\n  Name: %s\n  URL: %s\n"
+            "  Organization: %s\n  Description: %s",
+            registry_info.get('id', 'N/A'), registry_info.get('name', 'N/A'),
+            registry_info.get('url', 'N/A'),
+            registry_info.get('organization', {}).get('name', 'N/A'),
+            registry_info.get('description', 'N/A'))
         
         return output
         
     except Exception as e:
-        logger.error(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         sys.exit(1)
 
 
+def cmd_all(args):
+    """Get services, service types and registry information in one run."""
+    logger = args.logger
+    logger.info("🔍 Fetching services, service types and registry information...")
+    
+    try:
+        registry = get_registry(args)
+        
+        # The three requests are independent; issue them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            services_future = executor.submit(registry.get_services)
+            types_future = executor.submit(registry.get_service_types)
+            info_future = executor.submit(registry.get_service_info)
+            services = services_future.result()
+            service_types = types_future.result()
+            registry_info = info_future.result()
+        
+        logger.info("✓ Found %d services and %d service types", len(services), len(service_types))
+        
+        # Build the output document only when it is saved
+        output = None
+        if args.output:
+            output = {
+                "timestamp": _RUN_TS,
+                "total_services": len(services),
+                "total_types": len(service_types),
+                "registry_info": registry_info,
+                "service_types": service_types,
+                "services": services
+            }
+            save_output(output, args.output, args.format)
+            logger.info("💾 Saved to %s", args.output)
+        
+        # Print summary
+        logger.info(
+            "\n📋 Registry Summary:\n  Registry: %s\n  Services: %d\n  Service Types: %d",
+            (registry_info or {}).get('name', 'N/A'), len(services), len(service_types))
+        
+        return output
+        
+    except Exception as e:
+        logger.error("❌ Error: %s", e)
+        sys.exit(1)
+
+
+# Output options shared by every subcommand
+OUTPUT_ARGS = [
+    (('-o', '--output'), {'metavar': 'FILE', 'help': "Save results to file ('-' for stdout)"}),
+    (('-f', '--format'), {'choices': ['json', 'text'], 'default': 'json',
+                          'help': 'Output format (default: json)'}),
+]
+
+# (name, help, handler, command-specific arguments)
+SUBCOMMANDS = [
+    ('services', 'List services', cmd_list_services, [
+        (('-t', '--type'), {'metavar': 'TYPE',
+                            'help': 'Filter services by type (e.g., trs, wes, tes)'}),
+    ]),
+    ('service', 'Get service by ID', cmd_get_service, [
+        (('-i', '--id'), {'metavar': 'ID', 'help': 'Service ID to retrieve'}),
+    ]),
+    ('types', 'List service types', cmd_list_types, []),
+    ('info', 'Get registry information', cmd_registry_info, []),
+    ('all', 'Get services, service types and registry information', cmd_all, []),
+]
+
+
+def add_output_args(parser):
+    """Register the shared output options on a subcommand parser."""
+    for flags, kwargs in OUTPUT_ARGS:
+        parser.add_argument(*flags, **kwargs)
+
+
 def main():
     """Main entry point for CLI."""
     parser = argparse.ArgumentParser(
@@ -235,6 +336,7 @@ Commands:
   service     Get a specific service by ID
   types       List all service types
   info        Get registry information
+  all         Get services, types and registry information in one run
 
 Examples:
   fairbio-ga4gh-registry services
@@ -242,7 +344,11 @@ Examples:
   fairbio-ga4gh-registry service --id org.dockstore.dockstoreapi -o dockstore.json
   fairbio-ga4gh-registry types -o service_types.json
   fairbio-ga4gh-registry info
+  fairbio-ga4gh-registry all -o registry_snapshot.json
   fairbio-ga4gh-registry services --type wes -f text -o wes_services.txt
+  fairbio-ga4gh-registry --no-cache services
+
+Responses are cached in ~/.cache/fairbio so repeated commands skip the network.
 
 Reference:
   https://github.com/ga4gh-discovery/ga4gh-service-registry
@@ -260,6 +366,17 @@ Reference:
         action="store_true",
         help="Enable verbose logging"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the registry instead of using cached responses"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        metavar="SECONDS",
+        help="Lifetime of newly cached responses (default: from Cache-Control/Expires headers, else 300)"
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -268,82 +385,24 @@ Reference:
     
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
     
-    # Services command
-    services_parser = subparsers.add_parser('services', help='List services')
-    services_parser.add_argument(
-        '-t', '--type',
-        metavar='TYPE',
-        help='Filter services by type (e.g., trs, wes, tes)'
-    )
-    services_parser.add_argument(
-        '-o', '--output',
-        metavar='FILE',
-        help='Save results to file'
-    )
-    services_parser.add_argument(
-        '-f', '--format',
-        choices=['json', 'text'],
-        default='json',
-        help='Output format (default: json)'
-    )
-    services_parser.set_defaults(func=cmd_list_services)
-    
-    # Service command (singular - get by ID)
-    service_parser = subparsers.add_parser('service', help='Get service by ID')
-    service_parser.add_argument(
-        '-i', '--id',
-        metavar='ID',
-        help='Service ID to retrieve'
-    )
-    service_parser.add_argument(
-        '-o', '--output',
-        metavar='FILE',
-        help='Save results to file'
-    )
-    service_parser.add_argument(
-        '-f', '--format',
-        choices=['json', 'text'],
-        default='json',
-        help='Output format (default: json)'
-    )
-    service_parser.set_defaults(func=cmd_get_service)
-    
-    # Types command
-    types_parser = subparsers.add_parser('types', help='List service types')
-    types_parser.add_argument(
-        '-o', '--output',
-        metavar='FILE',
-        help='Save results to file'
-    )
-    types_parser.add_argument(
-        '-f', '--format',
-        choices=['json', 'text'],
-        default='json',
-        help='Output format (default: json)'
-    )
-    types_parser.set_defaults(func=cmd_list_types)
-    
-    # Info command
-    info_parser = subparsers.add_parser('info', help='Get registry information')
-    info_parser.add_argument(
-        '-o', '--output',
-        metavar='FILE',
-        help='Save results to file'
-    )
-    info_parser.add_argument(
-        '-f', '--format',
-        choices=['json', 'text'],
-        default='json',
-        help='Output format (default: json)'
-    )
-    info_parser.set_defaults(func=cmd_registry_info)
+    for name, help_, func, extra_args in SUBCOMMANDS:
+        subparser = subparsers.add_parser(name, help=help_)
+        for flags, kwargs in extra_args:
+            subparser.add_argument(*flags, **kwargs)
+        add_output_args(subparser)
+        subparser.set_defaults(func=func)
     
     args = parser.parse_args()
+    args.logger = setup_logging(args.verbose)
     
     if not args.command:
         parser.print_help()
         sys.exit(0)
     
+    # One pooled session serves every request made by the command
+    from fairbio.utils.http import get_session
+    args.session = get_session()
+    
     # Execute command
     args.func(args)
 
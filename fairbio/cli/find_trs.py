@@ -16,63 +16,73 @@ Usage:
 """
 
 import sys
-import json
 import argparse
+import functools
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 
-from fairbio.registries.trs_registry import ToolRegistryService
+from fairbio.utils.output import save_output, print_json as print_json_output
 
+# Timestamp recorded in every output document, computed once per run
+_RUN_TS = datetime.now(timezone.utc).isoformat()
 
-def setup_logging(verbose: bool = False):
+
+def setup_logging(verbose: bool = False, quiet: bool = False):
     """Configure logging."""
-    level = logging.DEBUG if verbose else logging.INFO
+    if quiet:
+        level = logging.WARNING
+    else:
+        level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
         level=level,
         format='%(message)s'
     )
+    # httpx logs every request at INFO; keep that out of normal CLI output
+    logging.getLogger("httpx").setLevel(level if verbose else logging.WARNING)
     return logging.getLogger(__name__)
 
 
-def save_output(data, output_file: str, format: str = "json"):
-    """Save output to file in specified format."""
-    if format == "json":
-        with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2)
-    elif format == "text":
-        with open(output_file, 'w') as f:
-            if isinstance(data, dict):
-                f.write(json.dumps(data, indent=2))
-            elif isinstance(data, list):
-                for item in data:
-                    if isinstance(item, dict):
-                        f.write(json.dumps(item) + "\n")
-                    else:
-                        f.write(str(item) + "\n")
-            else:
-                f.write(str(data))
+def get_trs(args):
+    """Create a TRS client for the registry given on the command line."""
+    # Imported here so that --help and argument errors never load the HTTP stack
+    from fairbio.registries.trs_registry import ToolRegistryService
+    return ToolRegistryService(args.registry, cache=not args.no_cache, cache_ttl=args.cache_ttl,
+                               http2=args.http2)
 
 
-def print_json_output(data):
-    """Print data as formatted JSON to stdout."""
-    print(json.dumps(data, indent=2))
+# Error shown for each argument a command can require. --id, --version and
+# --type are enforced by argparse (required=True) instead.
+_REQUIRED_ARG_ERRORS = {
+    'registry': "❌ Registry URL is required (use -r/--registry)",
+}
 
 
+def require_args(*names):
+    """Exit with an error before running a command if any of ``names`` is unset."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(args):
+            missing = [name for name in names if not getattr(args, name, None)]
+            if missing:
+                setup_logging(args.verbose, args.quiet).error(_REQUIRED_ARG_ERRORS[missing[0]])
+                sys.exit(1)
+            return func(args)
+        return wrapper
+    return decorator
+
+
+@require_args("registry")
 def cmd_list_tools(args):
     """List all tools or filter by criteria."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
     
     if args.limit > 100:
         logger.warning(f"⚠️  Dockstore enforces a server-side limit of 100 (you requested {args.limit}). Use --all to paginate automatically.")
         args.limit = 100
-    
-    if not args.all and total == args.limit:
-        logger.info(f"⚠️  Results may be truncated at {total}. Use --all to fetch everything.")
+
+    if args.use_async and not args.all:
+        logger.warning("⚠️  --async only applies together with --all; fetching a single page.")
 
     if args.all:
         logger.info(f"🔍 Fetching ALL tools from {args.registry}...")
@@ -82,7 +92,7 @@ def cmd_list_tools(args):
     
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
 
         # Build filters
         filters = {}
@@ -100,30 +110,25 @@ def cmd_list_tools(args):
             filters['toolClass'] = args.toolclass
 
         if args.all:
-            response = trs.get_all_tools(limit=args.limit, **filters)
-            tool_list = response.get('all_tools', [])
-            total = response.get('total_count', 0)
+            if args.use_async:
+                # Imported here; asyncio is slow to import and only needed for --async
+                import asyncio
+                response = asyncio.run(trs.get_all_tools_async(limit=args.limit, **filters))
+            else:
+                response = trs.get_all_tools(limit=args.limit, **filters)
+            tool_list = response['all_tools']
+            total = response['total_count']
             pagination_info = {
-                'total_pages': response.get('total_pages'),
-                'page_size': response.get('page_size'),
+                'total_pages': response['total_pages'],
+                'page_size': response['page_size'],
             }
         else:
-            tools = trs.get_tools(limit=args.limit, offset=args.offset, **filters)
-
-            pagination_info = {}
-            if isinstance(tools, dict):
-                tool_list = tools.get('tools', []) if 'tools' in tools else [tools] if tools else []
-                pagination_info = {
-                    'current_offset': tools.get('current_offset'),
-                    'current_limit': tools.get('current_limit'),
-                    'next_page': tools.get('next_page'),
-                    'last_page': tools.get('last_page'),
-                    'self_link': tools.get('self_link'),
-                }
-                total = len(tool_list)
-            else:
-                tool_list = tools if isinstance(tools, list) else []
-                total = len(tool_list)
+            page = trs.get_tools(limit=args.limit, offset=args.offset, **filters)
+            tool_list = page.tools
+            pagination_info = page.pagination
+            total = len(tool_list)
+            if total == args.limit:
+                logger.info(f"⚠️  Results may be truncated at {total}. Use --all to fetch everything.")
 
         # Apply local filtering for toolclass when provided
         if args.toolclass:
@@ -140,9 +145,9 @@ def cmd_list_tools(args):
         logger.info(f"✓ Found {total} tools")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
-            "pagination": {k: v for k, v in pagination_info.items() if v is not None},
+            "pagination": pagination_info,
             "total_tools": total,
             "filters": filters if filters else None,
             "tools": tool_list
@@ -156,29 +161,31 @@ def cmd_list_tools(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Tools Summary:")
-        for i, tool in enumerate(tool_list[:10], 1):
-            tool_id = tool.get('id', 'Unknown')
-            name = tool.get('name', 'N/A')
-            org = tool.get('organization', 'N/A')
-            tc = tool.get('toolclass', {}).get('name', 'N/A') if isinstance(tool.get('toolclass'), dict) else tool.get('toolclass', 'N/A')
-            logger.info(f"  {i}. {tool_id}")
-            logger.info(f"     Name: {name}, Org: {org}, Class: {tc}")
-        if total > 10:
-            logger.info(f"  ... and {total - 10} more")
-
-        if args.all:
-            logger.info("\n📄 Pagination Summary:")
-            logger.info(f"  Total Pages Retrieved: {pagination_info.get('total_pages')}")
-            logger.info(f"  Page Size: {pagination_info.get('page_size')}")
-        elif pagination_info.get('current_offset') is not None:
-            logger.info("\n📄 Pagination:")
-            logger.info(f"  Current Offset: {pagination_info.get('current_offset')}")
-            logger.info(f"  Current Limit: {pagination_info.get('current_limit')}")
-            if pagination_info.get('next_page'):
-                logger.info(f"  Next Page Available: Yes")
-            if pagination_info.get('last_page'):
-                logger.info(f"  Has Last Page: Yes")
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["\n📋 Tools Summary:"]
+            for i, tool in enumerate(tool_list[:10], 1):
+                tool_id = tool.get('id', 'Unknown')
+                name = tool.get('name', 'N/A')
+                org = tool.get('organization', 'N/A')
+                tc = tool.get('toolclass', {}).get('name', 'N/A') if isinstance(tool.get('toolclass'), dict) else tool.get('toolclass', 'N/A')
+                lines.append(f"  {i}. {tool_id}")
+                lines.append(f"     Name: {name}, Org: {org}, Class: {tc}")
+            if total > 10:
+                lines.append(f"  ... and {total - 10} more")
+
+            if args.all:
+                lines.append("\n📄 Pagination Summary:")
+                lines.append(f"  Total Pages Retrieved: {pagination_info.get('total_pages')}")
+                lines.append(f"  Page Size: {pagination_info.get('page_size')}")
+            elif pagination_info.get('current_offset') is not None:
+                lines.append("\n📄 Pagination:")
+                lines.append(f"  Current Offset: {pagination_info.get('current_offset')}")
+                lines.append(f"  Current Limit: {pagination_info.get('current_limit')}")
+                if pagination_info.get('next_page'):
+                    lines.append(f"  Next Page Available: Yes")
+                if pagination_info.get('last_page'):
+                    lines.append(f"  Has Last Page: Yes")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -187,18 +194,15 @@ def cmd_list_tools(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_search_tools(args):
     """Search for tools using common filters (convenience command)."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Searching tools in {args.registry}...")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
         tool_list = trs.search_tools(
             query=args.query,
             descriptor_type=args.descriptor_type,
@@ -210,7 +214,7 @@ def cmd_search_tools(args):
         logger.info(f"✓ Found {total} tools")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "search": {
                 "query": args.query,
@@ -230,15 +234,17 @@ def cmd_search_tools(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Search Results:")
-        for i, tool in enumerate(tool_list[:10], 1):
-            tool_id = tool.get('id', 'Unknown')
-            name = tool.get('name', 'N/A')
-            org = tool.get('organization', 'N/A')
-            logger.info(f"  {i}. {tool_id}")
-            logger.info(f"     Name: {name}, Org: {org}")
-        if total > 10:
-            logger.info(f"  ... and {total - 10} more")
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["\n📋 Search Results:"]
+            for i, tool in enumerate(tool_list[:10], 1):
+                tool_id = tool.get('id', 'Unknown')
+                name = tool.get('name', 'N/A')
+                org = tool.get('organization', 'N/A')
+                lines.append(f"  {i}. {tool_id}")
+                lines.append(f"     Name: {name}, Org: {org}")
+            if total > 10:
+                lines.append(f"  ... and {total - 10} more")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -247,22 +253,15 @@ def cmd_search_tools(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_get_tool(args):
     """Get a specific tool by ID."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
-
-    if not args.id:
-        logger.error("❌ Tool ID is required (use --id)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Fetching tool: {args.id}")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
         tool = trs.get_tool(args.id)
 
         if not tool:
@@ -272,7 +271,7 @@ def cmd_get_tool(args):
         logger.info(f"✓ Found tool: {tool.get('name', args.id)}")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "tool": tool
         }
@@ -285,20 +284,24 @@ def cmd_get_tool(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Tool Details:")
-        logger.info(f"  ID: {tool.get('id', 'N/A')}")
-        logger.info(f"  Name: {tool.get('name', 'N/A')}")
-        logger.info(f"  URL: {tool.get('url', 'N/A')}")
-        logger.info(f"  Organization: {tool.get('organization', 'N/A')}")
-        logger.info(f"  Description: {tool.get('description', 'N/A')}")
-        logger.info(f"  Tool Class: {tool.get('toollass', {}).get('name', 'N/A')}")
-
-        versions = tool.get('versions', [])
-        logger.info(f"  Versions: {len(versions)}")
-        for v in versions[:5]:
-            logger.info(f"    - {v.get('id', 'N/A')} ({v.get('name', 'N/A')})")
-        if len(versions) > 5:
-            logger.info(f"    ... and {len(versions) - 5} more")
+        if logger.isEnabledFor(logging.INFO):
+            lines = [
+                "\n📋 Tool Details:",
+                f"  ID: {tool.get('id', 'N/A')}",
+                f"  Name: {tool.get('name', 'N/A')}",
+                f"  URL: {tool.get('url', 'N/A')}",
+                f"  Organization: {tool.get('organization', 'N/A')}",
+                f"  Description: {tool.get('description', 'N/A')}",
+                f"  Tool Class: {tool.get('toollass', {}).get('name', 'N/A')}"
+            ]
+
+            versions = tool.get('versions', [])
+            lines.append(f"  Versions: {len(versions)}")
+            for v in versions[:5]:
+                lines.append(f"    - {v.get('id', 'N/A')} ({v.get('name', 'N/A')})")
+            if len(versions) > 5:
+                lines.append(f"    ... and {len(versions) - 5} more")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -307,28 +310,21 @@ def cmd_get_tool(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_list_versions(args):
     """List all versions of a tool."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
-
-    if not args.id:
-        logger.error("❌ Tool ID is required (use --id)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Fetching versions for tool: {args.id}")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
         versions = trs.get_tool_versions(args.id)
 
         logger.info(f"✓ Found {len(versions)} versions")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "tool_id": args.id,
             "total_versions": len(versions),
@@ -343,17 +339,19 @@ def cmd_list_versions(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Tool Versions:")
-        for i, version in enumerate(versions, 1):
-            v_id = version.get('id', 'N/A')
-            v_name = version.get('name', 'N/A')
-            is_prod = version.get('is_production', False)
-            prod_marker = " [PRODUCTION]" if is_prod else ""
-            logger.info(f"  {i}. {v_id} ({v_name}){prod_marker}")
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["\n📋 Tool Versions:"]
+            for i, version in enumerate(versions, 1):
+                v_id = version.get('id', 'N/A')
+                v_name = version.get('name', 'N/A')
+                is_prod = version.get('is_production', False)
+                prod_marker = " [PRODUCTION]" if is_prod else ""
+                lines.append(f"  {i}. {v_id} ({v_name}){prod_marker}")
 
-            descriptors = version.get('descriptor_type', [])
-            if descriptors:
-                logger.info(f"     Descriptor Types: {', '.join(descriptors)}")
+                descriptors = version.get('descriptor_type', [])
+                if descriptors:
+                    lines.append(f"     Descriptor Types: {', '.join(descriptors)}")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -362,26 +360,15 @@ def cmd_list_versions(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_get_version(args):
     """Get a specific tool version."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
-
-    if not args.id:
-        logger.error("❌ Tool ID is required (use --id)")
-        sys.exit(1)
-
-    if not args.version:
-        logger.error("❌ Version ID is required (use --version)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Fetching version {args.version} of tool {args.id}")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
         version = trs.get_tool_version(args.id, args.version)
 
         if not version:
@@ -391,7 +378,7 @@ def cmd_get_version(args):
         logger.info(f"✓ Found version: {version.get('name', args.version)}")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "tool_id": args.id,
             "version": version
@@ -405,23 +392,27 @@ def cmd_get_version(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Version Details:")
-        logger.info(f"  ID: {version.get('id', 'N/A')}")
-        logger.info(f"  Name: {version.get('name', 'N/A')}")
-        logger.info(f"  URL: {version.get('url', 'N/A')}")
-        logger.info(f"  Production: {version.get('is_production', False)}")
-        logger.info(f"  Verified: {version.get('verified', False)}")
+        if logger.isEnabledFor(logging.INFO):
+            lines = [
+                "\n📋 Version Details:",
+                f"  ID: {version.get('id', 'N/A')}",
+                f"  Name: {version.get('name', 'N/A')}",
+                f"  URL: {version.get('url', 'N/A')}",
+                f"  Production: {version.get('is_production', False)}",
+                f"  Verified: {version.get('verified', False)}"
+            ]
 
-        descriptors = version.get('descriptor_type', [])
-        logger.info(f"  Descriptor Types: {', '.join(descriptors) if descriptors else 'N/A'}")
+            descriptors = version.get('descriptor_type', [])
+            lines.append(f"  Descriptor Types: {', '.join(descriptors) if descriptors else 'N/A'}")
 
-        images = version.get('images', [])
-        if images:
-            logger.info(f"  Container Images:")
-            for img in images[:5]:
-                logger.info(f"    - {img.get('image_name', 'N/A')}")
-            if len(images) > 5:
-                logger.info(f"    ... and {len(images) - 5} more")
+            images = version.get('images', [])
+            if images:
+                lines.append(f"  Container Images:")
+                for img in images[:5]:
+                    lines.append(f"    - {img.get('image_name', 'N/A')}")
+                if len(images) > 5:
+                    lines.append(f"    ... and {len(images) - 5} more")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -430,30 +421,15 @@ def cmd_get_version(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_get_descriptor(args):
     """Get tool descriptor (CWL, WDL, etc.)."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
-
-    if not args.id:
-        logger.error("❌ Tool ID is required (use --id)")
-        sys.exit(1)
-
-    if not args.version:
-        logger.error("❌ Version ID is required (use --version)")
-        sys.exit(1)
-
-    if not args.type:
-        logger.error("❌ Descriptor type is required (use --type: CWL, WDL, NFL, GALAXY, SMK, etc.)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Fetching {args.type} descriptor for {args.id} v{args.version}")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
 
         if args.path:
             logger.info(f"   Relative path: {args.path}")
@@ -468,7 +444,7 @@ def cmd_get_descriptor(args):
         logger.info(f"✓ Found descriptor")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "tool_id": args.id,
             "version": args.version,
@@ -485,11 +461,13 @@ def cmd_get_descriptor(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Descriptor Preview:")
-        content = descriptor.get('content', '')[:500] if descriptor.get('content') else 'N/A'
-        logger.info(content)
-        if len(descriptor.get('content', '')) > 500:
-            logger.info("... (truncated)")
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["\n📋 Descriptor Preview:"]
+            content = descriptor.get('content', '')[:500] if descriptor.get('content') else 'N/A'
+            lines.append(content)
+            if len(descriptor.get('content', '')) > 500:
+                lines.append("... (truncated)")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -498,46 +476,36 @@ def cmd_get_descriptor(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_get_files(args):
     """Get list of files for a tool version."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
-    if not args.id:
-        logger.error("❌ Tool ID is required (use --id)")
-        sys.exit(1)
-
-    if not args.version:
-        logger.error("❌ Version ID is required (use --version)")
-        sys.exit(1)
-
-    if not args.type:
-        logger.error("❌ Descriptor type is required (use --type)")
+    if args.json and args.format == 'zip':
+        logger.error("❌ --json cannot be combined with --format zip")
         sys.exit(1)
 
     logger.info(f"🔍 Fetching files for {args.id} v{args.version} ({args.type})")
 
     try:
-        trs = ToolRegistryService(args.registry)
-        fmt = args.format if args.format == 'zip' else None
-        files = trs.get_tool_files(args.id, args.version, args.type, format=fmt)
-
-        if isinstance(files, bytes):
-            logger.info(f"✓ Retrieved zip file ({len(files)} bytes)")
-            if args.output:
-                with open(args.output, 'wb') as f:
-                    f.write(files)
-                logger.info(f"💾 Saved to {args.output}")
-            else:
+        trs = get_trs(args)
+        if args.format == 'zip':
+            if not args.output:
                 logger.info("ℹ️  Use -o/--output to save the zip file")
+                return
+
+            size = trs.download_tool_files(args.id, args.version, args.type, args.output)
+            if size is None:
+                logger.error("❌ Could not download zip file")
+                sys.exit(1)
+            logger.info(f"✓ Retrieved zip file ({size} bytes)")
+            logger.info(f"💾 Saved to {args.output}")
         else:
+            files = trs.get_tool_files(args.id, args.version, args.type)
             logger.info(f"✓ Found {len(files)} files")
 
             output = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _RUN_TS,
                 "registry_url": args.registry,
                 "tool_id": args.id,
                 "version": args.version,
@@ -554,49 +522,38 @@ def cmd_get_files(args):
                 save_output(output, args.output, args.format)
                 logger.info(f"💾 Saved to {args.output}")
 
-            logger.info("\n📋 Files:")
-            for i, file in enumerate(files[:20], 1):
-                path = file.get('path', 'N/A')
-                file_type = file.get('file_type', 'N/A')
-                logger.info(f"  {i}. {path} ({file_type})")
-            if len(files) > 20:
-                logger.info(f"  ... and {len(files) - 20} more")
+            if logger.isEnabledFor(logging.INFO):
+                lines = ["\n📋 Files:"]
+                for i, file in enumerate(files[:20], 1):
+                    path = file.get('path', 'N/A')
+                    file_type = file.get('file_type', 'N/A')
+                    lines.append(f"  {i}. {path} ({file_type})")
+                if len(files) > 20:
+                    lines.append(f"  ... and {len(files) - 20} more")
+                logger.info("\n".join(lines))
+
+            return output
 
     except Exception as e:
         logger.error(f"❌ Error: {e}")
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_get_tests(args):
     """Get test files for a tool version."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
-
-    if not args.id:
-        logger.error("❌ Tool ID is required (use --id)")
-        sys.exit(1)
-
-    if not args.version:
-        logger.error("❌ Version ID is required (use --version)")
-        sys.exit(1)
-
-    if not args.type:
-        logger.error("❌ Descriptor type is required (use --type)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Fetching test files for {args.id} v{args.version} ({args.type})")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
         tests = trs.get_tool_tests(args.id, args.version, args.type)
 
         logger.info(f"✓ Found {len(tests)} test files")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "tool_id": args.id,
             "version": args.version,
@@ -613,10 +570,12 @@ def cmd_get_tests(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Test Files:")
-        for i, test in enumerate(tests, 1):
-            url = test.get('url', 'N/A')
-            logger.info(f"  {i}. {url}")
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["\n📋 Test Files:"]
+            for i, test in enumerate(tests, 1):
+                url = test.get('url', 'N/A')
+                lines.append(f"  {i}. {url}")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -625,32 +584,21 @@ def cmd_get_tests(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_get_containerfile(args):
     """Get container specification(s) for a tool version (e.g., Dockerfiles)."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
-
-    if not args.id:
-        logger.error("❌ Tool ID is required (use --id)")
-        sys.exit(1)
-
-    if not args.version:
-        logger.error("❌ Version ID is required (use --version)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Fetching containerfile(s) for {args.id} v{args.version}")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
         containerfiles = trs.get_tool_containerfile(args.id, args.version)
 
         logger.info(f"✓ Found {len(containerfiles)} containerfile(s)")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "tool_id": args.id,
             "version": args.version,
@@ -666,13 +614,15 @@ def cmd_get_containerfile(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Containerfiles:")
-        for i, cf in enumerate(containerfiles, 1):
-            url = cf.get('url', 'N/A')
-            content_preview = (cf.get('content', '') or '')[:200]
-            logger.info(f"  {i}. URL: {url}")
-            if content_preview:
-                logger.info(f"     Preview: {content_preview}...")
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["\n📋 Containerfiles:"]
+            for i, cf in enumerate(containerfiles, 1):
+                url = cf.get('url', 'N/A')
+                content_preview = (cf.get('content', '') or '')[:200]
+                lines.append(f"  {i}. URL: {url}")
+                if content_preview:
+                    lines.append(f"     Preview: {content_preview}...")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -681,24 +631,21 @@ def cmd_get_containerfile(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_list_classes(args):
     """List all tool classes."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Fetching tool classes from {args.registry}...")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
         classes = trs.get_tool_classes()
 
         logger.info(f"✓ Found {len(classes)} tool classes")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "total_classes": len(classes),
             "tool_classes": classes
@@ -712,14 +659,16 @@ def cmd_list_classes(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Tool Classes:")
-        for i, cls in enumerate(classes, 1):
-            cls_id = cls.get('id', 'N/A')
-            name = cls.get('name', 'N/A')
-            description = cls.get('description', 'N/A')[:50]
-            logger.info(f"  {i}. {cls_id}")
-            logger.info(f"     Name: {name}")
-            logger.info(f"     {description}...")
+        if logger.isEnabledFor(logging.INFO):
+            lines = ["\n📋 Tool Classes:"]
+            for i, cls in enumerate(classes, 1):
+                cls_id = cls.get('id', 'N/A')
+                name = cls.get('name', 'N/A')
+                description = cls.get('description', 'N/A')[:50]
+                lines.append(f"  {i}. {cls_id}")
+                lines.append(f"     Name: {name}")
+                lines.append(f"     {description}...")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -728,18 +677,15 @@ def cmd_list_classes(args):
         sys.exit(1)
 
 
+@require_args("registry")
 def cmd_service_info(args):
     """Get TRS service information."""
-    logger = setup_logging(args.verbose)
-
-    if not args.registry:
-        logger.error("❌ Registry URL is required (use -r/--registry)")
-        sys.exit(1)
+    logger = setup_logging(args.verbose, args.quiet)
 
     logger.info(f"🔍 Fetching service info from {args.registry}...")
 
     try:
-        trs = ToolRegistryService(args.registry)
+        trs = get_trs(args)
         info = trs.get_service_info()
 
         if not info:
@@ -749,7 +695,7 @@ def cmd_service_info(args):
         logger.info(f"✓ Retrieved service info")
 
         output = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _RUN_TS,
             "registry_url": args.registry,
             "service_info": info
         }
@@ -762,15 +708,19 @@ def cmd_service_info(args):
             save_output(output, args.output, args.format)
             logger.info(f"💾 Saved to {args.output}")
 
-        logger.info("\n📋 Service Information:")
-        logger.info(f"  ID: {info.get('id', 'N/A')}")
-        logger.info(f"  Name: {info.get('name', 'N/A')}")
-        logger.info(f"  Description: {info.get('description', 'N/A')}")
-        logger.info(f"  Version: {info.get('version', 'N/A')}")
+        if logger.isEnabledFor(logging.INFO):
+            lines = [
+                "\n📋 Service Information:",
+                f"  ID: {info.get('id', 'N/A')}",
+                f"  Name: {info.get('name', 'N/A')}",
+                f"  Description: {info.get('description', 'N/A')}",
+                f"  Version: {info.get('version', 'N/A')}"
+            ]
 
-        org = info.get('organization', {})
-        if org:
-            logger.info(f"  Organization: {org.get('name', 'N/A')}")
+            org = info.get('organization', {})
+            if org:
+                lines.append(f"  Organization: {org.get('name', 'N/A')}")
+            logger.info("\n".join(lines))
 
         return output
 
@@ -779,6 +729,22 @@ def cmd_service_info(args):
         sys.exit(1)
 
 
+# Subcommand name -> handler
+_COMMANDS = {
+    'tools': cmd_list_tools,
+    'search': cmd_search_tools,
+    'tool': cmd_get_tool,
+    'versions': cmd_list_versions,
+    'version': cmd_get_version,
+    'descriptor': cmd_get_descriptor,
+    'files': cmd_get_files,
+    'tests': cmd_get_tests,
+    'containerfile': cmd_get_containerfile,
+    'classes': cmd_list_classes,
+    'info': cmd_service_info,
+}
+
+
 def main():
     """Main entry point for CLI."""
     parser = argparse.ArgumentParser(
@@ -814,6 +780,10 @@ Examples:
   fairbio-trs -r https://dockstore.org/api containerfile --id quay.io/foo/bar --version v1.0.0
   fairbio-trs -r https://dockstore.org/api classes
   fairbio-trs -r https://dockstore.org/api info
+  fairbio-trs -r https://dockstore.org/api --no-cache tool --id quay.io/foo/bar
+
+Service info, tool classes, tools and tool versions are cached in ~/.cache/fairbio
+and revalidated with ETag/Last-Modified once they expire.
 
 Reference:
   https://github.com/ga4gh/tool-registry-service-schemas
@@ -831,6 +801,27 @@ Reference:
         action="store_true",
         help="Enable verbose logging"
     )
+    parser.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="Only log warnings and errors (skips building the summaries)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the registry instead of using cached responses"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        metavar="SECONDS",
+        help="Lifetime of newly cached responses (default: from Cache-Control/Expires headers, else 300)"
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Send requests over HTTP/2 (requires fairbio[http2])"
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -839,8 +830,30 @@ Reference:
 
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
 
+    # Arguments shared between subcommands, attached through parents=[...]
+    id_args = argparse.ArgumentParser(add_help=False)
+    id_args.add_argument('--id', metavar='ID', required=True, help='Tool ID')
+
+    version_args = argparse.ArgumentParser(add_help=False)
+    version_args.add_argument('--version', metavar='VERSION', required=True, help='Version ID')
+
+    type_args = argparse.ArgumentParser(add_help=False)
+    type_args.add_argument('--type', metavar='TYPE', required=True,
+                           help='Descriptor type (CWL, WDL, NFL, GALAXY, SMK, PLAIN_CWL, PLAIN_WDL, etc.)')
+
+    output_args = argparse.ArgumentParser(add_help=False)
+    output_args.add_argument('-o', '--output', metavar='FILE', help='Save results to file')
+    output_args.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
+
+    format_args = argparse.ArgumentParser(add_help=False)
+    format_args.add_argument('-f', '--format', choices=['json', 'text'], default='json',
+                             help='Output format (default: json)')
+
+    io_args = [output_args, format_args]
+    version_ref_args = [id_args, version_args]
+
     # ── tools ──────────────────────────────────────────────────────────────
-    tools_parser = subparsers.add_parser('tools', help='List tools')
+    tools_parser = subparsers.add_parser('tools', help='List tools', parents=io_args)
     tools_parser.add_argument('--id', metavar='ID', help='Filter by tool ID')
     tools_parser.add_argument('--name', metavar='NAME', help='Filter by tool name')
     tools_parser.add_argument('--author', metavar='AUTHOR', help='Filter by author')
@@ -853,121 +866,61 @@ Reference:
                               help='Page size for each request (default: 100, max: 100)')
     tools_parser.add_argument('--all', action='store_true',
                               help='Fetch ALL tools by automatically paginating through all results')
+    tools_parser.add_argument('--async', dest='use_async', action='store_true',
+                              help='With --all, fetch pages with asyncio/aiohttp (requires the "async" extra)')
     tools_parser.add_argument('--offset', metavar='OFFSET',
                               help='Start index for manual pagination')
-    tools_parser.add_argument('-o', '--output', metavar='FILE', help='Save results to file')
-    tools_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                              help='Output format (default: json)')
-    tools_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    tools_parser.set_defaults(func=cmd_list_tools)
 
     # ── search ─────────────────────────────────────────────────────────────
-    search_parser = subparsers.add_parser('search', help='Search tools by name, type, or author')
+    search_parser = subparsers.add_parser('search', help='Search tools by name, type, or author',
+                                          parents=io_args)
     search_parser.add_argument('--query', metavar='QUERY', help='Search term (matches name/toolname)')
     search_parser.add_argument('--descriptor-type', metavar='TYPE',
                                help='Filter by descriptor type (CWL, WDL, NFL, GALAXY, SMK)')
     search_parser.add_argument('--author', metavar='AUTHOR', help='Filter by author')
     search_parser.add_argument('--limit', type=int, default=100,
                                help='Maximum number of results (default: 100, max: 100)')
-    search_parser.add_argument('-o', '--output', metavar='FILE', help='Save results to file')
-    search_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                               help='Output format (default: json)')
-    search_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    search_parser.set_defaults(func=cmd_search_tools)
 
     # ── tool ───────────────────────────────────────────────────────────────
-    tool_parser = subparsers.add_parser('tool', help='Get tool by ID')
-    tool_parser.add_argument('--id', metavar='ID', required=True, help='Tool ID')
-    tool_parser.add_argument('-o', '--output', metavar='FILE', help='Save results to file')
-    tool_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                             help='Output format (default: json)')
-    tool_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    tool_parser.set_defaults(func=cmd_get_tool)
+    subparsers.add_parser('tool', help='Get tool by ID', parents=[id_args] + io_args)
 
     # ── versions ───────────────────────────────────────────────────────────
-    versions_parser = subparsers.add_parser('versions', help='List tool versions')
-    versions_parser.add_argument('--id', metavar='ID', required=True, help='Tool ID')
-    versions_parser.add_argument('-o', '--output', metavar='FILE', help='Save results to file')
-    versions_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                                 help='Output format (default: json)')
-    versions_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    versions_parser.set_defaults(func=cmd_list_versions)
+    subparsers.add_parser('versions', help='List tool versions',
+                          parents=[id_args] + io_args)
 
     # ── version ────────────────────────────────────────────────────────────
-    version_parser = subparsers.add_parser('version', help='Get specific tool version')
-    version_parser.add_argument('--id', metavar='ID', required=True, help='Tool ID')
-    version_parser.add_argument('--version', metavar='VERSION', required=True, help='Version ID')
-    version_parser.add_argument('-o', '--output', metavar='FILE', help='Save results to file')
-    version_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                                help='Output format (default: json)')
-    version_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    version_parser.set_defaults(func=cmd_get_version)
+    subparsers.add_parser('version', help='Get specific tool version',
+                          parents=version_ref_args + io_args)
 
     # ── descriptor ─────────────────────────────────────────────────────────
-    descriptor_parser = subparsers.add_parser('descriptor', help='Get tool descriptor')
-    descriptor_parser.add_argument('--id', metavar='ID', required=True, help='Tool ID')
-    descriptor_parser.add_argument('--version', metavar='VERSION', required=True, help='Version ID')
-    descriptor_parser.add_argument('--type', metavar='TYPE', required=True,
-                                   help='Descriptor type (CWL, WDL, NFL, GALAXY, SMK, PLAIN_CWL, PLAIN_WDL, etc.)')
+    descriptor_parser = subparsers.add_parser('descriptor', help='Get tool descriptor',
+                                              parents=version_ref_args + [type_args] + io_args)
     descriptor_parser.add_argument('--path', metavar='PATH',
                                    help='Relative path to a secondary descriptor file '
                                         '(maps to GET /tools/{id}/versions/{version}/{type}/descriptor/{relative_path})')
-    descriptor_parser.add_argument('-o', '--output', metavar='FILE', help='Save to file')
-    descriptor_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                                   help='Output format (default: json)')
-    descriptor_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    descriptor_parser.set_defaults(func=cmd_get_descriptor)
 
     # ── files ──────────────────────────────────────────────────────────────
-    files_parser = subparsers.add_parser('files', help='Get tool files')
-    files_parser.add_argument('--id', metavar='ID', required=True, help='Tool ID')
-    files_parser.add_argument('--version', metavar='VERSION', required=True, help='Version ID')
-    files_parser.add_argument('--type', metavar='TYPE', required=True, help='Descriptor type')
-    files_parser.add_argument('-o', '--output', metavar='FILE', help='Save to file')
+    files_parser = subparsers.add_parser('files', help='Get tool files',
+                                         parents=version_ref_args + [type_args, output_args])
     files_parser.add_argument('-f', '--format', choices=['json', 'text', 'zip'], default='json',
                               help='Output format — use "zip" to download all files as a zip archive (default: json)')
-    files_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    files_parser.set_defaults(func=cmd_get_files)
 
     # ── tests ──────────────────────────────────────────────────────────────
-    tests_parser = subparsers.add_parser('tests', help='Get tool test files')
-    tests_parser.add_argument('--id', metavar='ID', required=True, help='Tool ID')
-    tests_parser.add_argument('--version', metavar='VERSION', required=True, help='Version ID')
-    tests_parser.add_argument('--type', metavar='TYPE', required=True, help='Descriptor type')
-    tests_parser.add_argument('-o', '--output', metavar='FILE', help='Save to file')
-    tests_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                              help='Output format (default: json)')
-    tests_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    tests_parser.set_defaults(func=cmd_get_tests)
+    subparsers.add_parser('tests', help='Get tool test files',
+                          parents=version_ref_args + [type_args] + io_args)
 
     # ── containerfile ──────────────────────────────────────────────────────
-    containerfile_parser = subparsers.add_parser(
+    subparsers.add_parser(
         'containerfile',
-        help='Get container specification(s) for a tool version (Dockerfiles, Singularity recipes, etc.)'
+        help='Get container specification(s) for a tool version (Dockerfiles, Singularity recipes, etc.)',
+        parents=version_ref_args + io_args
     )
-    containerfile_parser.add_argument('--id', metavar='ID', required=True, help='Tool ID')
-    containerfile_parser.add_argument('--version', metavar='VERSION', required=True, help='Version ID')
-    containerfile_parser.add_argument('-o', '--output', metavar='FILE', help='Save to file')
-    containerfile_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                                      help='Output format (default: json)')
-    containerfile_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    containerfile_parser.set_defaults(func=cmd_get_containerfile)
 
     # ── classes ────────────────────────────────────────────────────────────
-    classes_parser = subparsers.add_parser('classes', help='List tool classes')
-    classes_parser.add_argument('-o', '--output', metavar='FILE', help='Save results to file')
-    classes_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                                help='Output format (default: json)')
-    classes_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    classes_parser.set_defaults(func=cmd_list_classes)
+    subparsers.add_parser('classes', help='List tool classes', parents=io_args)
 
     # ── info ───────────────────────────────────────────────────────────────
-    info_parser = subparsers.add_parser('info', help='Get TRS service information')
-    info_parser.add_argument('-o', '--output', metavar='FILE', help='Save results to file')
-    info_parser.add_argument('-f', '--format', choices=['json', 'text'], default='json',
-                             help='Output format (default: json)')
-    info_parser.add_argument('--json', action='store_true', help='Print raw JSON to stdout')
-    info_parser.set_defaults(func=cmd_service_info)
+    subparsers.add_parser('info', help='Get TRS service information', parents=io_args)
 
     args = parser.parse_args()
 
@@ -975,7 +928,7 @@ Reference:
         parser.print_help()
         sys.exit(0)
 
-    args.func(args)
+    _COMMANDS[args.command](args)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
 """GA4GH clients for service discovery"""
 
 from .ga4gh_registry import GA4GHServiceRegistry
-from .trs_registry import ToolRegistryService
+from .trs_registry import DESCRIPTOR_TYPES, ToolRegistryService, ToolsPage, canonical_descriptor_type
+from fairbio.utils.http import get_session
 
 __all__ = [
     "GA4GHServiceRegistry",
-    "ToolRegistryService"
+    "ToolRegistryService",
+    "ToolsPage",
+    "DESCRIPTOR_TYPES",
+    "canonical_descriptor_type",
+    "get_session"
 ]
@@ -8,8 +8,39 @@ Reference: https://github.com/ga4gh-discovery/ga4gh-service-registry
 Specification: https://raw.githubusercontent.com/ga4gh-discovery/ga4gh-service-registry/develop/service-registry.yaml
 """
 
+import logging
+
 import requests
-import json
+
+from fairbio.utils.cache import MemoCache, cached_get
+from fairbio.utils.http import get_session, response_failed, stream_get
+from fairbio.utils.jsonparse import iter_json_items, parse_json
+
+
+logger = logging.getLogger(__name__)
+
+# Stand-in for a missing service "type" field
+_EMPTY = {}
+
+
+def _type_matches(service_type_obj, needle):
+    """
+    Check whether a service's type field contains a lowercase search term.
+    
+    Args:
+        service_type_obj (dict or str): The service's "type" field
+        needle (str): Lowercase service type to look for
+    
+    Returns:
+        bool: True if any part of the type contains the term
+    """
+    # Registry JSON is decoded into plain dicts/strs, so exact type checks suffice
+    if type(service_type_obj) is dict:
+        return any(type(value) is str and needle in value.lower()
+                   for value in service_type_obj.values())
+    if type(service_type_obj) is str:
+        return needle in service_type_obj.lower()
+    return False
 
 
 class GA4GHServiceRegistry(object):
@@ -22,18 +53,96 @@ class GA4GHServiceRegistry(object):
     # GA4GH Service Registry endpoint
     SERVICE_REGISTRY_URL = "https://registry.ga4gh.org/v1"
 
-    def __init__(self, registry_url=None):
+    def __init__(self, registry_url=None, cache=False, cache_ttl=None, session=None):
         """
         Initialize GA4GH Service Registry client.
         
         Args:
             registry_url (str): Base URL of the GA4GH service registry (default: official GA4GH registry)
+            cache (bool): Cache responses on disk between invocations (default: False)
+            cache_ttl (int): Lifetime of cached responses in seconds
+                             (default: derived from Cache-Control/Expires headers)
+            session (requests.Session): Session to reuse for requests
+                                        (default: the shared pooled session from get_session())
         """
         if registry_url is None:
             registry_url = self.SERVICE_REGISTRY_URL
         # Ensure registry URL has trailing slash for proper path joining
         self.registry_url = registry_url.rstrip('/') + '/'
-        self.session = requests.Session()
+        self.session = session if session is not None else get_session()
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        # get_services_by_type() results for the registry's own service list,
+        # keyed by lowercase service type
+        self._services_by_type = {}
+        # Decoded service and registry info responses, keyed by URL
+        self._memo = MemoCache()
+        # Whether GET /services honors a ?type= filter (None until a query tells)
+        self._server_supports_type_filter = None
+    
+    def _get_content(self, url):
+        """
+        GET a URL and return the raw body, going through the disk cache when enabled.
+        
+        Returns None if the server answered with an error status.
+        
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        if self.cache:
+            return cached_get(self.session, url, ttl=self.cache_ttl)
+        response = self.session.get(url, timeout=10)
+        if response_failed(response):
+            return None
+        return response.content
+    
+    def _get_json(self, url):
+        """
+        GET a URL and decode the JSON body.
+        
+        Returns None if the server answered with an error status.
+        
+        Raises:
+            requests.RequestException: If the request fails
+            ValueError: If the body is not valid JSON
+        """
+        content = self._get_content(url)
+        return None if content is None else parse_json(content)
+    
+    def _get_memoized(self, url):
+        """
+        GET a JSON endpoint once per client and reuse the decoded response.
+        
+        Returns None, without remembering it, if the server answered with an
+        error status.
+        
+        Raises:
+            requests.RequestException: If the request fails
+            ValueError: If the body is not valid JSON
+        """
+        data = self._memo.get(url)
+        if data is None:
+            data = self._get_json(url)
+            if data is not None:
+                self._memo.put(url, data)
+        return data
+    
+    def invalidate_cache(self, service_id=None):
+        """
+        Forget in-process responses so the next lookups query the registry again.
+        
+        Entries in the on-disk cache are unaffected; they expire on their own.
+        
+        Args:
+            service_id (str): Only forget this service (default: forget every
+                              service, registry info and per-type results)
+        """
+        if service_id is None:
+            self._memo.discard()
+            self._services_by_type.clear()
+        else:
+            service_url = f"{self.registry_url}services/{service_id}"
+            self._memo.discard(lambda url: url == service_url)
     
     def get_services(self):
         """
@@ -45,18 +154,39 @@ class GA4GHServiceRegistry(object):
             list: List of service configurations with metadata
         """
         try:
-            url = "{0}services".format(self.registry_url)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching services: {0}".format(e))
+            url = f"{self.registry_url}services"
+            services = self._get_json(url)
+            return [] if services is None else services
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Error fetching services: %s", e)
             return []
     
+    def get_services_raw(self):
+        """
+        List all services in the registry as the undecoded response body.
+        
+        GET /services
+        
+        Useful when the listing is only written back out, as it skips the
+        decode/encode round trip.
+        
+        Returns:
+            bytes: JSON array of service configurations
+        """
+        try:
+            url = f"{self.registry_url}services"
+            content = self._get_content(url)
+            return b"[]" if content is None else content
+        except requests.RequestException as e:
+            logger.warning("Error fetching services: %s", e)
+            return b"[]"
+    
     def get_service_by_id(self, service_id):
         """
         Find a specific service in the registry by ID.
         
+        Responses are kept for the lifetime of the client; see invalidate_cache().
+        
         GET /services/{serviceId}
         
         Args:
@@ -66,12 +196,10 @@ class GA4GHServiceRegistry(object):
             dict: Service information dictionary
         """
         try:
-            url = "{0}services/{1}".format(self.registry_url, service_id)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching service info: {0}".format(e))
+            url = f"{self.registry_url}services/{service_id}"
+            return self._get_memoized(url)
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Error fetching service info: %s", e)
             return None
     
     def get_service_types(self):
@@ -84,56 +212,139 @@ class GA4GHServiceRegistry(object):
             list: List of service type configurations
         """
         try:
-            url = "{0}services/types".format(self.registry_url)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching service types: {0}".format(e))
+            url = f"{self.registry_url}services/types"
+            types = self._get_json(url)
+            return [] if types is None else types
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Error fetching service types: %s", e)
             return []
     
     def get_service_info(self):
         """
         Get information about this service registry itself.
         
+        Responses are kept for the lifetime of the client; see invalidate_cache().
+        
         GET /service-info
         
         Returns:
             dict: Service information about the registry
         """
         try:
-            url = "{0}service-info".format(self.registry_url)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching registry info: {0}".format(e))
+            url = f"{self.registry_url}service-info"
+            return self._get_memoized(url)
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Error fetching registry info: %s", e)
             return None
     
-    def get_services_by_type(self, service_type):
+    def get_services_by_type(self, service_type, services=None):
         """
         Filter services by type (convenience method).
         
         Args:
-            service_type (str): Type of service to filter for (e.g., 'trs', 'wes', 'tes')
+            service_type (str): Type of service to filter for (e.g., 'trs', 'wes', 'tes');
+                                matched case-insensitively against the type's
+                                artifact, group and version
+            services (list): Already-fetched services to filter instead of
+                             requesting the service list again (default: None).
+                             Non-empty results for the registry's own list are
+                             kept for the lifetime of the client.
+        
+        Without the disk cache, the registry is first asked to filter the list
+        itself with ``?type=``; registries that ignore the parameter are
+        detected from the response and filtered client-side from then on.
+        With the disk cache, the full list is fetched once and shared by all types.
             
         Returns:
             list: List of services matching the specified type
         """
-        all_services = self.get_services()
-        if not all_services:
-            return []
+        needle = service_type.lower()
+        if services is None:
+            if needle in self._services_by_type:
+                return list(self._services_by_type[needle])
+            filtered = None
+            if not self.cache and self._server_supports_type_filter is not False:
+                filtered = self._get_services_filtered_by_server(service_type, needle)
+            if filtered is None:
+                if self.cache:
+                    services = self.get_services()
+                else:
+                    # Keep only the matches while the service list is parsed
+                    services = self._stream_services()
+                filtered = [service for service in services
+                            if _type_matches(service.get("type", _EMPTY), needle)]
+            # An empty result may come from a failed request; don't keep it
+            if filtered:
+                self._services_by_type[needle] = filtered
+            return list(filtered)
+        
+        return [service for service in services
+                if _type_matches(service.get("type", _EMPTY), needle)]
+    
+    def _get_services_filtered_by_server(self, service_type, needle):
+        """
+        Ask the registry for the services of one type, falling back when it can't filter.
         
+        GET /services?type={service_type}
+        
+        Records in ``_server_supports_type_filter`` whether the registry
+        applied the filter. A registry that ignores it sends the full list,
+        which is then filtered here, so no second request is needed. One that
+        answers with an error status is not asked with ``?type=`` again.
+        
+        Args:
+            service_type (str): Type of service to filter for
+            needle (str): Lowercase service type matched client-side
+        
+        Returns:
+            list: Matching services, or None if the registry returned no
+                  matches or rejected the request and the full list should
+                  be checked instead
+        """
         filtered = []
-        for service in all_services:
-            service_type_obj = service.get("type", {})
-            if isinstance(service_type_obj, dict):
-                artifact = service_type_obj.get("artifact", "")
-                # Extract the service name from artifact (e.g., "tool-registry-service" -> "trs")
-                if service_type in artifact or service_type.lower() in str(service_type_obj).lower():
-                    filtered.append(service)
-            elif isinstance(service_type_obj, str):
-                if service_type.lower() in service_type_obj.lower():
-                    filtered.append(service)
-        
-        return filtered
+        ignored = 0
+        try:
+            url = f"{self.registry_url}services"
+            with stream_get(self.session, url, params={"type": service_type}) as chunks:
+                for service in iter_json_items(chunks):
+                    if _type_matches(service.get("type", _EMPTY), needle):
+                        filtered.append(service)
+                    else:
+                        ignored += 1
+        except requests.HTTPError as e:
+            # The registry rejects the parameter; don't send it again
+            logger.debug("Registry does not support ?type= filtering: %s", e)
+            self._server_supports_type_filter = False
+            return None
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Error fetching services: %s", e)
+            return None
+        if ignored:
+            # Non-matching services came back, so the parameter was ignored
+            self._server_supports_type_filter = False
+            return filtered
+        if filtered:
+            self._server_supports_type_filter = True
+            return filtered
+        # Nothing came back: the registry may match types more strictly than
+        # the client-side substring match does, so check the full list
+        return None
+    
+    def _stream_services(self, params=None):
+        """
+        Iterate over the registry's services as the response is parsed.
+        
+        GET /services
+        
+        Args:
+            params (dict): Query parameters (default: None)
+        
+        Yields:
+            dict: Service configuration
+        """
+        try:
+            url = f"{self.registry_url}services"
+            with stream_get(self.session, url, params=params) as chunks:
+                yield from iter_json_items(chunks)
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Error fetching services: %s", e)
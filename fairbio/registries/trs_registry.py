@@ -8,9 +8,77 @@ Reference: https://github.com/ga4gh/tool-registry-service-schemas
 OpenAPI Specification: https://raw.githubusercontent.com/ga4gh/tool-registry-service-schemas/develop/openapi/openapi.yaml
 """
 
-import requests
+import logging
+import os
+import tempfile
+import time
 import json
 from urllib.parse import urlparse, parse_qs
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from fairbio.utils.cache import MemoCache, cached_get, ttl_from_headers
+from fairbio.utils.http import (
+    DEFAULT_HEADERS, REQUEST_ERRORS, RETRY_STATUSES, get_http2_client, get_session,
+    request_errors, response_failed, retry_delay, stream_get, stream_response
+)
+from fairbio.utils.jsonparse import iter_json_items, parse_json
+
+logger = logging.getLogger(__name__)
+
+# Failures reported by the endpoint methods: transport errors and invalid JSON bodies
+FETCH_ERRORS = REQUEST_ERRORS + (ValueError,)
+
+
+@dataclass
+class ToolsPage(object):
+    """One page of a TRS tool listing.
+    
+    Attributes:
+        tools (list): Tools on this page
+        pagination (dict): Pagination links and offsets present in the response headers
+                           (next_page, last_page, self_link, current_offset, current_limit)
+    """
+    __slots__ = ("tools", "pagination")
+    
+    tools: list
+    pagination: dict
+
+
+# Zip archives are not JSON; override the clients' default Accept header
+ZIP_HEADERS = {"Accept": "application/zip, */*"}
+
+# Response headers carrying TRS pagination state
+PAGINATION_HEADERS = ("next_page", "last_page", "self_link", "current_offset", "current_limit")
+
+# Descriptor types accepted in per-version TRS paths (DescriptorTypeWithPlain in the spec)
+DESCRIPTOR_TYPES = frozenset((
+    "CWL", "WDL", "NFL", "GALAXY", "SMK",
+    "PLAIN_CWL", "PLAIN_WDL", "PLAIN_NFL", "PLAIN_GALAXY", "PLAIN_SMK",
+))
+
+# Case-insensitive spellings mapped to their spec casing
+_DESCRIPTOR_TYPE_NAMES = {name.lower(): name for name in DESCRIPTOR_TYPES}
+
+
+def canonical_descriptor_type(descriptor_type):
+    """
+    Validate a descriptor type and return its TRS spec spelling.
+    
+    Args:
+        descriptor_type (str): Descriptor type in any case (e.g., 'cwl', 'Plain_WDL')
+    
+    Returns:
+        str: Descriptor type as spelled in the TRS spec (e.g., 'CWL', 'PLAIN_WDL')
+    
+    Raises:
+        ValueError: If the descriptor type is not defined by the TRS spec
+    """
+    try:
+        return _DESCRIPTOR_TYPE_NAMES[descriptor_type.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError("Unknown descriptor type '{0}' (expected one of: {1})".format(
+            descriptor_type, ", ".join(sorted(DESCRIPTOR_TYPES)))) from None
 
 
 class ToolRegistryService(object):
@@ -23,13 +91,43 @@ class ToolRegistryService(object):
     # Standard TRS API path suffix (most registries use /ga4gh/trs/v2)
     TRS_API_PATH = "/ga4gh/trs/v2"
     
-    def __init__(self, registry_url):
+    # Maximum concurrent page requests made by get_all_tools
+    MAX_PAGE_WORKERS = 16
+    
+    # Maximum in-flight page requests made by get_all_tools_async
+    MAX_ASYNC_PAGE_REQUESTS = 64
+    
+    # Retries per page in get_all_tools_async, matching the shared session's policy
+    ASYNC_PAGE_RETRIES = 3
+    
+    # Maximum concurrent requests made by the *_bulk methods; keep at or below
+    # the session's per-host pool size so workers never wait for a connection
+    MAX_BULK_WORKERS = 16
+    
+    # Process-wide memo of effectively static endpoints (service-info, toolClasses),
+    # keyed by URL: {url: (expires_at or None, data)}
+    _static_cache = {}
+    
+    def __init__(self, registry_url, session=None, cache=False, cache_ttl=None, http2=False):
         """
         Initialize TRS client.
         
         Args:
             registry_url (str): Base URL of the TRS registry (e.g., https://dockstore.org)
                               Can include the full path or just the base URL.
+            session (requests.Session): Session to use for requests (default: chosen
+                                        by ``http2``)
+            cache (bool): Cache service info, tool classes, tools and tool versions
+                          on disk between invocations (default: False)
+            cache_ttl (int): Lifetime of cached responses in seconds
+                             (default: derived from Cache-Control/Expires headers)
+            http2 (bool): Without a session, use the shared HTTP/2 client instead
+                          of the shared pooled requests session. The HTTP/2 client
+                          only retries failed connections, not 429/5xx responses
+                          (default: False)
+        
+        Raises:
+            ImportError: If http2 is True and httpx[http2] is not installed
         """
         # Remove trailing slash and TRS path if present
         self.registry_url = registry_url.rstrip('/')
@@ -38,7 +136,147 @@ class ToolRegistryService(object):
         
         # Construct the full TRS endpoint
         self.trs_url = self.registry_url + self.TRS_API_PATH
-        self.session = requests.Session()
+        # Prefix shared by every tool endpoint, built once per client
+        self._tools_url = self.trs_url + "/tools"
+        if session is None:
+            if http2:
+                session = get_http2_client()
+                if session is None:
+                    raise ImportError(
+                        "HTTP/2 support requires httpx[http2]; "
+                        "install with: pip install fairbio[http2]")
+            else:
+                session = get_session()
+        self.session = session
+        # FETCH_ERRORS, plus httpx's errors when the session is an HTTP/2 client
+        self._fetch_errors = request_errors(session) + (ValueError,)
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        # Decoded tool and tool version responses, keyed by URL
+        self._memo = MemoCache()
+    
+    def _version_url(self, tool_id, version_id):
+        """Build the URL of a tool version, the prefix of all per-version endpoints."""
+        return f"{self._tools_url}/{tool_id}/versions/{version_id}"
+    
+    def _get_content(self, url):
+        """
+        GET a URL and return the raw body, going through the disk cache when enabled.
+        
+        Returns None if the server answered with an error status.
+        
+        Raises:
+            REQUEST_ERRORS: If the request fails
+        """
+        if self.cache:
+            return cached_get(self.session, url, ttl=self.cache_ttl)
+        response = self.session.get(url, timeout=10)
+        if response_failed(response):
+            return None
+        return response.content
+    
+    def _get_json(self, url, params=None):
+        """
+        GET a URL and decode the JSON body.
+        
+        Returns None if the server answered with an error status.
+        
+        Raises:
+            FETCH_ERRORS: If the request fails or the body is not valid JSON
+        """
+        response = self.session.get(url, params=params, timeout=10)
+        if response_failed(response):
+            return None
+        return parse_json(response.content)
+    
+    def _fetch_json(self, url, default, message, *args, get=None):
+        """
+        GET a JSON endpoint, logging failures instead of raising them.
+        
+        Args:
+            url (str): Endpoint URL
+            default: Value returned when the request fails
+            message (str): Warning logged when the request raises, formatted
+                           lazily with ``args``; the error is appended
+            *args: Values for the placeholders in ``message``
+            get (callable): Function performing the GET, returning None on an
+                            error status (default: _get_json)
+        
+        Returns:
+            Decoded response, or ``default`` on failure
+        """
+        try:
+            data = (get or self._get_json)(url)
+        except self._fetch_errors as e:
+            logger.warning(message + ": %s", *args, e)
+            return default
+        return default if data is None else data
+    
+    def _get_memoized(self, url):
+        """
+        GET a JSON endpoint once per client and reuse the decoded response.
+        
+        Returns None, without remembering it, if the server answered with an
+        error status.
+        
+        Raises:
+            FETCH_ERRORS: If the request fails or the body is not valid JSON
+        """
+        data = self._memo.get(url)
+        if data is None:
+            content = self._get_content(url)
+            if content is None:
+                return None
+            data = self._memo.put(url, parse_json(content))
+        return data
+    
+    def invalidate_cache(self, tool_id=None):
+        """
+        Forget in-process responses so the next lookups query the registry again.
+        
+        Entries in the on-disk cache are unaffected; they expire on their own.
+        
+        Args:
+            tool_id (str): Only forget the tool and its versions (default: forget
+                           every tool, plus service info and tool classes)
+        """
+        if tool_id is None:
+            self._memo.discard()
+            for url in (f"{self.trs_url}/service-info", f"{self.trs_url}/toolClasses"):
+                self._static_cache.pop(url, None)
+        else:
+            tool_url = f"{self._tools_url}/{tool_id}"
+            self._memo.discard(lambda url: url == tool_url or url.startswith(tool_url + "/"))
+    
+    def _get_static(self, url):
+        """
+        GET an endpoint whose response rarely changes, memoized across clients.
+        
+        Entries honor Cache-Control/Expires lifetimes; without them they are
+        kept for the rest of the process. With the disk cache enabled, that
+        cache is used instead. Returns None if the server answered with an
+        error status.
+        
+        Raises:
+            FETCH_ERRORS: If the request fails or the body is not valid JSON
+        """
+        if self.cache:
+            content = self._get_content(url)
+            return None if content is None else parse_json(content)
+        
+        entry = self._static_cache.get(url)
+        if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+            return entry[1]
+        
+        response = self.session.get(url, timeout=10)
+        if response_failed(response):
+            return None
+        data = parse_json(response.content)
+        ttl = ttl_from_headers(response.headers, default=None)
+        if ttl != 0:
+            expires_at = None if ttl is None else time.monotonic() + ttl
+            self._static_cache[url] = (expires_at, data)
+        return data
     
     def get_service_info(self):
         """
@@ -49,14 +287,8 @@ class ToolRegistryService(object):
         Returns:
             dict: Service information including name, version, and organization
         """
-        try:
-            url = "{0}/service-info".format(self.trs_url)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching TRS service info: {0}".format(e))
-            return None
+        url = f"{self.trs_url}/service-info"
+        return self._fetch_json(url, None, "Error fetching TRS service info", get=self._get_static)
     
     def get_tools(self, limit=100, offset=0, **filters):
         """
@@ -82,43 +314,48 @@ class ToolRegistryService(object):
                 - checker (bool): Return only checker workflows
         
         Returns:
-            dict: Response containing tools list and pagination headers
+            ToolsPage: Tools on the requested page and its pagination headers
         """
         try:
-            url = "{0}/tools".format(self.trs_url)
-            # Normalize case-insensitive client filters to TRS spec casing
-            if "toolclass" in filters and "toolClass" not in filters:
-                filters["toolClass"] = filters.pop("toolclass")
-            if "descriptortype" in filters and "descriptorType" not in filters:
-                filters["descriptorType"] = filters.pop("descriptortype")
-
-            params = {"limit": limit}
-            if offset is not None:
-                params["offset"] = offset
+            url = self._tools_url
+            if filters:
+                # Normalize case-insensitive client filters to TRS spec casing
+                if "toolclass" in filters and "toolClass" not in filters:
+                    filters["toolClass"] = filters.pop("toolclass")
+                if "descriptortype" in filters and "descriptorType" not in filters:
+                    filters["descriptorType"] = filters.pop("descriptortype")
             
-            # Add any additional filters
-            params.update(filters)
+            # Build the query in one dict display rather than item by item
+            if offset is None:
+                params = {"limit": limit, **filters}
+            else:
+                params = {"limit": limit, "offset": offset, **filters}
             
             response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return {
-                "tools": response.json(),  # body is a plain array
-                # pagination info is in headers:
-                "next_page": response.headers.get("next_page"),
-                "last_page": response.headers.get("last_page"),
-                "self_link": response.headers.get("self_link"),
-                "current_offset": response.headers.get("current_offset"),
-                "current_limit": response.headers.get("current_limit"),
-            }
-        except requests.RequestException as e:
-            print("Error fetching tools: {0}".format(e))
-            return []
+            if response_failed(response):
+                return ToolsPage(tools=[], pagination={})
+            headers = response.headers
+            # The body is a plain array; pagination info is in headers
+            return ToolsPage(
+                tools=parse_json(response.content),
+                pagination={name: headers[name] for name in PAGINATION_HEADERS if name in headers}
+            )
+        except self._fetch_errors as e:
+            logger.warning("Error fetching tools: %s", e)
+            return ToolsPage(tools=[], pagination={})
     
     def get_all_tools(self, limit=100, **filters):
         """
         Fetch ALL tools from the registry by automatically paginating through results.
         
         This method automatically handles pagination and combines all results.
+        When the first page's links show how the offset advances (see
+        _offset_stride) and its ``last_page`` header carries a numeric offset,
+        the remaining pages are fetched concurrently. When the offset
+        semantics are known but there is no ``last_page``, pages are
+        prefetched in windows of MAX_PAGE_WORKERS until a page without a
+        ``next_page`` link. Otherwise the ``next_page`` links are followed
+        one at a time.
         
         Args:
             limit (int): Page size for each request (default: 1000)
@@ -127,52 +364,280 @@ class ToolRegistryService(object):
         Returns:
             dict: Response with all_tools list, total_count, and pagination summary
         """
+        page_size = min(limit, 100)
         try:
-            page_size = min(limit, 100)
-            all_tools = []
+            url = self._tools_url
             
-            # Use next_page URL from headers rather than manually incrementing offset
-            next_url = None
-            offset = 0
+            def fetch_page(offset):
+                response = self.session.get(
+                    url,
+                    params={"limit": page_size, "offset": offset, **filters},
+                    timeout=10
+                )
+                response.raise_for_status()
+                return response
             
-            while True:
-                if next_url:
+            response = fetch_page(0)
+            page_tools = parse_json(response.content)  # body is a plain array per spec
+            all_tools = list(page_tools)
+            
+            # Pagination state lives in HEADERS, not the body
+            stride = self._offset_stride(response.headers, page_tools, page_size)
+            last_offset = self._page_offset(response.headers.get("last_page"))
+            if stride is not None and last_offset is not None:
+                # Every page offset is known up front; fetch them concurrently
+                offsets = range(stride, last_offset + 1, stride)
+                with ThreadPoolExecutor(max_workers=self.MAX_PAGE_WORKERS) as executor:
+                    # map() yields pages in offset order
+                    for page in executor.map(fetch_page, offsets):
+                        all_tools.extend(parse_json(page.content))
+            elif stride is not None:
+                all_tools.extend(self._prefetch_pages(fetch_page, stride, stride, page_size))
+            else:
+                next_url = response.headers.get("next_page")
+                while page_tools and next_url and len(page_tools) >= page_size:
                     # Use the server-provided next_page URL directly
-                    response = self.session.get(next_url)
-                else:
-                    response = self.session.get(
-                        f"{self.trs_url}/tools",
-                        params={"limit": page_size, "offset": offset, **filters}
-                    )
+                    response = self.session.get(next_url, timeout=10)
+                    response.raise_for_status()
+                    page_tools = parse_json(response.content)
+                    all_tools.extend(page_tools)
+                    next_url = response.headers.get("next_page")
+            
+            return self._all_tools_result(all_tools, page_size)
+        except self._fetch_errors as e:
+            logger.warning("Error fetching all tools: %s", e)
+            return self._all_tools_result([], page_size)
+    
+    def _prefetch_pages(self, fetch_page, offset, stride, page_size):
+        """
+        Fetch consecutive pages from ``offset`` until the last one, a window at a time.
+        
+        Pages are consumed in order and the walk stops at the first page that
+        is short or has no ``next_page`` link. Requests already issued past
+        that page are discarded, so errors from offsets beyond the end are
+        never raised.
+        
+        Args:
+            fetch_page (callable): Function fetching the page at an offset
+            offset (int): Offset of the first page to fetch
+            stride (int): Offset step between pages (see _offset_stride)
+            page_size (int): Number of tools per page
+        
+        Returns:
+            list: Tools from the fetched pages, in order
+        """
+        tools = []
+        window = self.MAX_PAGE_WORKERS * stride
+        with ThreadPoolExecutor(max_workers=self.MAX_PAGE_WORKERS) as executor:
+            while True:
+                for page in executor.map(fetch_page, range(offset, offset + window, stride)):
+                    page_tools = parse_json(page.content)
+                    tools.extend(page_tools)
+                    if len(page_tools) < page_size or not page.headers.get("next_page"):
+                        return tools
+                offset += window
+    
+    async def get_all_tools_async(self, limit=100, **filters):
+        """
+        Fetch ALL tools from the registry using asyncio and aiohttp.
+        
+        Same as get_all_tools(), but when the page offsets are known up front
+        every page is requested at once on a single event loop, with at most
+        MAX_ASYNC_PAGE_REQUESTS in flight. Like the shared session, pages are
+        retried up to ASYNC_PAGE_RETRIES times on connection errors and
+        429/5xx responses. Falls back to get_all_tools() when aiohttp is not
+        installed.
+        
+        Args:
+            limit (int): Page size for each request (default: 100)
+            **filters: Additional filter parameters (same as get_tools)
+        
+        Returns:
+            dict: Response with all_tools list, total_count, and pagination summary
+        """
+        # Imported here so that only async callers pay for importing asyncio
+        import asyncio
+        try:
+            # Imported here; aiohttp is an optional extra and slow to import
+            import aiohttp
+        except ImportError:
+            return self.get_all_tools(limit=limit, **filters)
+        
+        page_size = min(limit, 100)
+        semaphore = asyncio.Semaphore(self.MAX_ASYNC_PAGE_REQUESTS)
+        timeout = aiohttp.ClientTimeout(total=10)
+        try:
+            async with aiohttp.ClientSession(timeout=timeout, headers=DEFAULT_HEADERS) as session:
                 
-                response.raise_for_status()
-                page_tools = response.json()  # body is a plain array per spec
+                async def fetch_page(url, params=None):
+                    async with semaphore:
+                        for attempt in range(self.ASYNC_PAGE_RETRIES + 1):
+                            retry_after = None
+                            try:
+                                async with session.get(url, params=params) as response:
+                                    if (response.status not in RETRY_STATUSES
+                                            or attempt == self.ASYNC_PAGE_RETRIES):
+                                        response.raise_for_status()
+                                        return parse_json(await response.read()), response.headers
+                                    retry_after = response.headers.get("Retry-After")
+                            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                                if attempt == self.ASYNC_PAGE_RETRIES:
+                                    raise
+                            await asyncio.sleep(retry_delay(attempt, retry_after))
                 
-                if not page_tools:
-                    break
-                    
-                all_tools.extend(page_tools)
+                def offset_params(offset):
+                    return {"limit": page_size, "offset": offset, **filters}
                 
-                # Pagination state lives in HEADERS, not the body
-                next_url = response.headers.get("next_page")
+                page_tools, headers = await fetch_page(self._tools_url, offset_params(0))
+                all_tools = list(page_tools)
                 
-                if not next_url or len(page_tools) < page_size:
-                    break
+                stride = self._offset_stride(headers, page_tools, page_size)
+                last_offset = self._page_offset(headers.get("last_page"))
+                if stride is not None and last_offset is not None:
+                    # gather() returns pages in offset order
+                    pages = await asyncio.gather(*(
+                        fetch_page(self._tools_url, offset_params(offset))
+                        for offset in range(stride, last_offset + 1, stride)
+                    ))
+                    for tools, _ in pages:
+                        all_tools.extend(tools)
+                else:
+                    next_url = headers.get("next_page")
+                    while page_tools and next_url and len(page_tools) >= page_size:
+                        page_tools, headers = await fetch_page(next_url)
+                        all_tools.extend(page_tools)
+                        next_url = headers.get("next_page")
             
-            return {
-                "all_tools": all_tools,
-                "total_count": len(all_tools),
-                "total_pages": (len(all_tools) + page_size - 1) // page_size,
-                "page_size": page_size,
-            }
-        except requests.RequestException as e:
-            print("Error fetching all tools: {0}".format(e))
-            return {"all_tools": [], "total_count": 0, "total_pages": 0}
+            return self._all_tools_result(all_tools, page_size)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning("Error fetching all tools: %s", e)
+            return self._all_tools_result([], page_size)
+    
+    def stream_tools(self, limit=100, **filters):
+        """
+        Iterate over ALL tools in the registry without building the full list.
+        
+        Pages are requested one at a time and each is parsed incrementally
+        (with ijson when installed), so tools are yielded as they arrive and
+        only one page's bytes are in flight at once. Like :meth:`get_all_tools`,
+        pages after the first are reached through the server's ``next_page``
+        links, so registries that page by item offset and by page number are
+        both handled. Iteration ends after the first short page or when there
+        is no ``next_page`` link.
+        
+        Args:
+            limit (int): Page size for each request (default: 100)
+            **filters: Additional filter parameters (same as get_tools)
+        
+        Yields:
+            dict: Tool information
+        """
+        page_size = min(limit, 100)
+        url = self._tools_url
+        params = {"limit": page_size, "offset": 0, **filters}
+        try:
+            while url:
+                count = 0
+                with stream_response(self.session, url, params=params) as (headers, chunks):
+                    for tool in iter_json_items(chunks):
+                        count += 1
+                        yield tool
+                if count < page_size:
+                    return
+                # The next_page URL already carries limit, offset and filters
+                url, params = headers.get("next_page"), None
+        except self._fetch_errors as e:
+            logger.warning("Error streaming tools: %s", e)
+    
+    def _fan_out(self, fetch, keys):
+        """
+        Call ``fetch(*key)`` for every key concurrently and yield results as they complete.
+        
+        Args:
+            fetch (callable): Endpoint method to call
+            keys (iterable): Argument tuples, one per call
+        
+        Yields:
+            tuple: (key, result) pairs in completion order
+        """
+        with ThreadPoolExecutor(max_workers=self.MAX_BULK_WORKERS) as executor:
+            futures = {executor.submit(fetch, *key): key for key in keys}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                # Don't wait on requests nobody will read if iteration stops early
+                for future in futures:
+                    future.cancel()
+    
+    @staticmethod
+    def _all_tools_result(all_tools, page_size):
+        """Build the get_all_tools() result for the fetched tools."""
+        return {
+            "all_tools": all_tools,
+            "total_count": len(all_tools),
+            "total_pages": (len(all_tools) + page_size - 1) // page_size,
+            "page_size": page_size,
+        }
+    
+    @classmethod
+    def _offset_stride(cls, headers, page_tools, page_size):
+        """
+        Work out how the registry's offset parameter advances between pages.
+        
+        TRS leaves the meaning of ``offset`` to the registry: some use item
+        indexes (0, 100, 200, ...), others such as Dockstore use page numbers
+        (0, 1, 2, ...). The first page is requested with offset 0, so the
+        offset in its ``next_page`` link tells the two apart.
+        
+        Args:
+            headers (Mapping): Response headers of the first page
+            page_tools (list): Tools on the first page
+            page_size (int): Number of tools requested per page
+        
+        Returns:
+            int: Offset step between pages (page_size for item offsets, 1 for
+                 page numbers), or None if the following offsets can't be
+                 predicted and the next_page links must be followed instead
+        """
+        if not page_tools or len(page_tools) < page_size:
+            return None
+        next_offset = cls._page_offset(headers.get("next_page"))
+        if next_offset == page_size or next_offset == 1:
+            return next_offset
+        return None
+    
+    @staticmethod
+    def _page_offset(page_url):
+        """
+        Extract the numeric offset from a pagination link.
+        
+        Args:
+            page_url (str): URL from a next_page/last_page header
+        
+        Returns:
+            int: Offset, or None if the link is missing or its offset is not numeric
+        """
+        if not page_url:
+            return None
+        # Fast path: the offset is a plain "?offset=" or "&offset=" parameter
+        head, sep, tail = page_url.rpartition("offset=")
+        if sep and head[-1:] in ("?", "&"):
+            try:
+                return int(tail.partition("&")[0].partition("#")[0])
+            except ValueError:
+                pass
+        try:
+            return int(parse_qs(urlparse(page_url).query)["offset"][0])
+        except (KeyError, ValueError):
+            return None
     
     def get_tool(self, tool_id):
         """
         Retrieve a specific tool by ID.
         
+        Responses are kept for the lifetime of the client; see invalidate_cache().
+        
         GET /tools/{id}
         
         Args:
@@ -181,19 +646,16 @@ class ToolRegistryService(object):
         Returns:
             dict: Tool information including versions
         """
-        try:
-            url = "{0}/tools/{1}".format(self.trs_url, tool_id)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching tool '{0}': {1}".format(tool_id, e))
-            return None
+        url = f"{self._tools_url}/{tool_id}"
+        return self._fetch_json(url, None, "Error fetching tool '%s'",
+                                tool_id, get=self._get_memoized)
     
     def get_tool_versions(self, tool_id):
         """
         List all versions of a specific tool.
         
+        Responses are kept for the lifetime of the client; see invalidate_cache().
+        
         GET /tools/{id}/versions
         
         Args:
@@ -202,19 +664,16 @@ class ToolRegistryService(object):
         Returns:
             list: List of tool versions
         """
-        try:
-            url = "{0}/tools/{1}/versions".format(self.trs_url, tool_id)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching versions for tool '{0}': {1}".format(tool_id, e))
-            return []
+        url = f"{self._tools_url}/{tool_id}/versions"
+        return self._fetch_json(url, [], "Error fetching versions for tool '%s'",
+                                tool_id, get=self._get_memoized)
     
     def get_tool_version(self, tool_id, version_id):
         """
         Retrieve a specific version of a tool.
         
+        Responses are kept for the lifetime of the client; see invalidate_cache().
+        
         GET /tools/{id}/versions/{version_id}
         
         Args:
@@ -224,15 +683,27 @@ class ToolRegistryService(object):
         Returns:
             dict: Tool version information
         """
-        try:
-            url = "{0}/tools/{1}/versions/{2}".format(self.trs_url, tool_id, version_id)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching tool version '{0}' for tool '{1}': {2}".format(
-                version_id, tool_id, e))
-            return None
+        url = self._version_url(tool_id, version_id)
+        return self._fetch_json(url, None, "Error fetching tool version '%s' for tool '%s'",
+                                version_id, tool_id, get=self._get_memoized)
+    
+    def get_tool_versions_bulk(self, tool_ids):
+        """
+        List the versions of several tools concurrently.
+        
+        Requests share the client's session and run on up to MAX_BULK_WORKERS
+        threads; results are yielded as soon as each one arrives.
+        
+        Args:
+            tool_ids (iterable): Unique identifiers of the tools
+        
+        Yields:
+            tuple: (tool_id, versions) pairs in completion order, where versions
+                   is the get_tool_versions() result
+        """
+        for (tool_id,), versions in self._fan_out(self.get_tool_versions,
+                                                  ((tool_id,) for tool_id in tool_ids)):
+            yield tool_id, versions
     
     def get_tool_descriptor(self, tool_id, version_id, descriptor_type):
         """
@@ -247,17 +718,37 @@ class ToolRegistryService(object):
         
         Returns:
             dict: File wrapper containing descriptor content
+        
+        Raises:
+            ValueError: If descriptor_type is not a TRS descriptor type
         """
-        try:
-            url = "{0}/tools/{1}/versions/{2}/{3}/descriptor".format(
-                self.trs_url, tool_id, version_id, descriptor_type)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching {0} descriptor for tool '{1}' version '{2}': {3}".format(
-                descriptor_type, tool_id, version_id, e))
-            return None
+        descriptor_type = canonical_descriptor_type(descriptor_type)
+        url = f"{self._version_url(tool_id, version_id)}/{descriptor_type}/descriptor"
+        return self._fetch_json(url, None, "Error fetching %s descriptor for tool '%s' version '%s'",
+                                descriptor_type, tool_id, version_id)
+    
+    def get_descriptors_bulk(self, triples):
+        """
+        Get the descriptors of several tool versions concurrently.
+        
+        Requests share the client's session and run on up to MAX_BULK_WORKERS
+        threads; results are yielded as soon as each one arrives.
+        
+        Args:
+            triples (iterable): (tool_id, version_id, descriptor_type) tuples
+        
+        Yields:
+            tuple: ((tool_id, version_id, descriptor_type), descriptor) pairs in
+                   completion order, with descriptor_type in TRS spec casing and
+                   descriptor the get_tool_descriptor() result
+        
+        Raises:
+            ValueError: If any descriptor_type is not a TRS descriptor type,
+                        before any request is sent
+        """
+        keys = [(tool_id, version_id, canonical_descriptor_type(descriptor_type))
+                for tool_id, version_id, descriptor_type in triples]
+        return self._fan_out(self.get_tool_descriptor, keys)
     
     def get_tool_descriptor_by_path(self, tool_id, version_id, descriptor_type, relative_path):
         """
@@ -273,16 +764,13 @@ class ToolRegistryService(object):
         
         Returns:
             dict: File wrapper containing descriptor content
+        
+        Raises:
+            ValueError: If descriptor_type is not a TRS descriptor type
         """
-        try:
-            url = "{0}/tools/{1}/versions/{2}/{3}/descriptor/{4}".format(
-                self.trs_url, tool_id, version_id, descriptor_type, relative_path)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching descriptor file '{0}': {1}".format(relative_path, e))
-            return None
+        descriptor_type = canonical_descriptor_type(descriptor_type)
+        url = f"{self._version_url(tool_id, version_id)}/{descriptor_type}/descriptor/{relative_path}"
+        return self._fetch_json(url, None, "Error fetching descriptor file '%s'", relative_path)
     
     def get_tool_tests(self, tool_id, version_id, descriptor_type):
         """
@@ -297,17 +785,14 @@ class ToolRegistryService(object):
         
         Returns:
             list: List of test file wrappers
+        
+        Raises:
+            ValueError: If descriptor_type is not a TRS descriptor type
         """
-        try:
-            url = "{0}/tools/{1}/versions/{2}/{3}/tests".format(
-                self.trs_url, tool_id, version_id, descriptor_type)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching tests for tool '{0}' version '{1}': {2}".format(
-                tool_id, version_id, e))
-            return []
+        descriptor_type = canonical_descriptor_type(descriptor_type)
+        url = f"{self._version_url(tool_id, version_id)}/{descriptor_type}/tests"
+        return self._fetch_json(url, [], "Error fetching tests for tool '%s' version '%s'",
+                                tool_id, version_id)
     
     def get_tool_files(self, tool_id, version_id, descriptor_type, format=None):
         """
@@ -323,26 +808,75 @@ class ToolRegistryService(object):
         
         Returns:
             list or bytes: List of tool files or zip file content
+        
+        Raises:
+            ValueError: If descriptor_type is not a TRS descriptor type
         """
+        descriptor_type = canonical_descriptor_type(descriptor_type)
         try:
-            url = "{0}/tools/{1}/versions/{2}/{3}/files".format(
-                self.trs_url, tool_id, version_id, descriptor_type)
+            url = f"{self._version_url(tool_id, version_id)}/{descriptor_type}/files"
             params = {}
             if format:
                 params['format'] = format
             
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
             # Return raw bytes if zip format requested
             if format == 'zip':
-                return response.content
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching files for tool '{0}' version '{1}': {2}".format(
-                tool_id, version_id, e))
+                with stream_get(self.session, url, params=params,
+                                headers=ZIP_HEADERS) as chunks:
+                    return b"".join(chunks)
+            
+            files = self._get_json(url, params)
+            return [] if files is None else files
+        except self._fetch_errors as e:
+            logger.warning("Error fetching files for tool '%s' version '%s': %s",
+                           tool_id, version_id, e)
             return [] if not format else None
     
+    def download_tool_files(self, tool_id, version_id, descriptor_type, output_file):
+        """
+        Download all files for a tool version as a zip archive.
+        
+        The archive is streamed to disk in chunks, so it is never held in memory.
+        It is written to a temporary file next to ``output_file`` and only moved
+        into place once complete, so a failed download leaves no partial file.
+        
+        GET /tools/{id}/versions/{version_id}/{type}/files?format=zip
+        
+        Args:
+            tool_id (str): Unique identifier of the tool
+            version_id (str): Version identifier
+            descriptor_type (str): Descriptor type
+            output_file (str): Path to write the zip archive to
+        
+        Returns:
+            int: Number of bytes written, or None if the download failed
+        
+        Raises:
+            ValueError: If descriptor_type is not a TRS descriptor type
+        """
+        descriptor_type = canonical_descriptor_type(descriptor_type)
+        try:
+            url = f"{self._version_url(tool_id, version_id)}/{descriptor_type}/files"
+            written = 0
+            fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(output_file) or ".",
+                                            prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    with stream_get(self.session, url, params={"format": "zip"},
+                                    headers=ZIP_HEADERS) as chunks:
+                        for chunk in chunks:
+                            f.write(chunk)
+                            written += len(chunk)
+                os.replace(tmp_name, output_file)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+            return written
+        except self._fetch_errors as e:
+            logger.warning("Error downloading files for tool '%s' version '%s': %s",
+                           tool_id, version_id, e)
+            return None
+    
     def get_tool_containerfile(self, tool_id, version_id):
         """
         Get container specification(s) for a tool version.
@@ -356,16 +890,9 @@ class ToolRegistryService(object):
         Returns:
             list: List of container file wrappers (e.g., Dockerfiles, Singularity recipes)
         """
-        try:
-            url = "{0}/tools/{1}/versions/{2}/containerfile".format(
-                self.trs_url, tool_id, version_id)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching containerfile for tool '{0}' version '{1}': {2}".format(
-                tool_id, version_id, e))
-            return []
+        url = f"{self._version_url(tool_id, version_id)}/containerfile"
+        return self._fetch_json(url, [], "Error fetching containerfile for tool '%s' version '%s'",
+                                tool_id, version_id)
     
     def get_tool_classes(self):
         """
@@ -376,14 +903,8 @@ class ToolRegistryService(object):
         Returns:
             list: List of tool classes (e.g., CommandLineTool, Workflow)
         """
-        try:
-            url = "{0}/toolClasses".format(self.trs_url)
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print("Error fetching tool classes: {0}".format(e))
-            return []
+        url = f"{self.trs_url}/toolClasses"
+        return self._fetch_json(url, [], "Error fetching tool classes", get=self._get_static)
     
     def search_tools(self, query=None, descriptor_type=None, author=None, limit=1000):
         """
@@ -408,5 +929,4 @@ class ToolRegistryService(object):
         if author:
             filters["author"] = author
         
-        result = self.get_tools(**filters)
-        return result if isinstance(result, list) else result.get("tools", [])
+        return self.get_tools(**filters).tools
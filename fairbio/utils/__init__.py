@@ -1,3 +1,42 @@
 """Utilities for HTTP operations, file handling, and common decorators"""
 
-__all__ = []
+from .output import save_output, save_output_raw, print_json
+
+__all__ = [
+    "MemoCache",
+    "cached_get",
+    "read_cache",
+    "write_cache",
+    "ttl_from_headers",
+    "save_output",
+    "save_output_raw",
+    "print_json",
+    "parse_json",
+    "create_session",
+    "get_session",
+    "create_http2_client",
+    "get_http2_client"
+]
+
+# Submodule providing each lazily loaded name
+_LAZY = {
+    "MemoCache": "cache",
+    "cached_get": "cache",
+    "read_cache": "cache",
+    "write_cache": "cache",
+    "ttl_from_headers": "cache",
+    "parse_json": "jsonparse",
+    "create_session": "http",
+    "get_session": "http",
+    "create_http2_client": "http",
+    "get_http2_client": "http",
+}
+
+
+def __getattr__(name):
+    # The cache, JSON and HTTP helpers are loaded only when first used so the
+    # CLI can import output helpers without pulling in the rest of the package.
+    if name in _LAZY:
+        from importlib import import_module
+        return getattr(import_module("." + _LAZY[name], __name__), name)
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
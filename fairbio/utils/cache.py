@@ -0,0 +1,327 @@
+"""
+On-disk HTTP response cache
+
+Stores raw response bodies under ``~/.cache/fairbio`` (or ``$XDG_CACHE_HOME/fairbio``),
+one file per URL. Each file's modification time is set to the moment the entry
+expires, so a freshness check is a single ``stat`` call. The response's
+``ETag``/``Last-Modified`` validators are kept in a ``.meta`` file next to the
+body, so an expired entry is revalidated with a conditional request and reused
+on ``304 Not Modified``.
+
+``MemoCache`` is the in-process tier in front of it: a bounded map of decoded
+responses that registry clients consult before touching the disk or network.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from email.utils import parsedate_to_datetime
+
+# Lifetime used when a response carries no caching headers
+DEFAULT_TTL = 300
+
+# Default number of decoded responses a MemoCache keeps
+MEMO_SIZE = 1024
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser() / "fairbio"
+
+_MAX_AGE_RE = re.compile(r"(?:s-)?max-age\s*=\s*(\d+)")
+
+
+def cache_path(url, cache_dir=None):
+    """
+    Get the cache file path for a URL.
+
+    Args:
+        url (str): Request URL
+        cache_dir (Path): Cache directory (default: CACHE_DIR)
+
+    Returns:
+        Path: Location of the cached response body
+    """
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+    return Path(cache_dir or CACHE_DIR) / digest
+
+
+def ttl_from_headers(headers, default=DEFAULT_TTL):
+    """
+    Derive a cache lifetime from response headers.
+
+    ``Cache-Control`` takes precedence over ``Expires``; ``no-store`` and
+    ``no-cache`` disable caching.
+
+    Args:
+        headers (Mapping): Response headers
+        default (int): Lifetime in seconds when no caching headers are present
+
+    Returns:
+        int: Lifetime in seconds (0 means do not cache)
+    """
+    cache_control = (headers.get("Cache-Control") or "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if match:
+        return int(match.group(1))
+
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            # Invalid Expires values (e.g. "0") mean already expired
+            return 0
+        return max(0, int(expires_at - time.time()))
+
+    return default
+
+
+def _meta_path(path):
+    """Get the path of the validators and caching headers file belonging to a cached body."""
+    return path.with_name(path.name + ".meta")
+
+
+def _write_atomic(path, content, mtime):
+    """Atomically write ``content`` to ``path`` and set its modification time."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.utime(tmp_name, (mtime, mtime))
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def read_cache(url, cache_dir=None):
+    """
+    Read a cached response body if it has not expired.
+
+    Args:
+        url (str): Request URL
+        cache_dir (Path): Cache directory (default: CACHE_DIR)
+
+    Returns:
+        bytes: Cached body, or None on a miss
+    """
+    path = cache_path(url, cache_dir)
+    try:
+        if path.stat().st_mtime > time.time():
+            return path.read_bytes()
+    except OSError:
+        pass
+    return None
+
+
+def read_meta(url, cache_dir=None):
+    """
+    Read the response headers stored alongside a cached body.
+
+    Args:
+        url (str): Request URL
+        cache_dir (Path): Cache directory (default: CACHE_DIR)
+
+    Returns:
+        dict: Stored ``etag``, ``last_modified``, ``cache_control`` and
+              ``expires`` values (empty if nothing is cached)
+    """
+    path = cache_path(url, cache_dir)
+    try:
+        meta = json.loads(_meta_path(path).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not path.exists():
+        return {}
+    return meta
+
+
+def read_validators(url, cache_dir=None, meta=None):
+    """
+    Get conditional request headers for revalidating a cached response.
+
+    Args:
+        url (str): Request URL
+        cache_dir (Path): Cache directory (default: CACHE_DIR)
+        meta (dict): Headers already read with read_meta() (default: read them)
+
+    Returns:
+        dict: ``If-None-Match``/``If-Modified-Since`` headers (empty if nothing is cached)
+    """
+    if meta is None:
+        meta = read_meta(url, cache_dir)
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def write_cache(url, content, ttl, cache_dir=None, headers=None):
+    """
+    Atomically store a response body for ``ttl`` seconds.
+
+    Failures to write are ignored; the cache is best-effort.
+
+    Args:
+        url (str): Request URL
+        content (bytes): Response body
+        ttl (int): Lifetime in seconds
+        cache_dir (Path): Cache directory (default: CACHE_DIR)
+        headers (Mapping): Response headers to take ETag/Last-Modified validators
+                           and the Cache-Control/Expires headers they revalidate with from
+    """
+    path = cache_path(url, cache_dir)
+    expires_at = time.time() + ttl
+    meta = {}
+    if headers is not None:
+        meta = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "cache_control": headers.get("Cache-Control"),
+            "expires": headers.get("Expires"),
+        }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, content, expires_at)
+        if meta.get("etag") or meta.get("last_modified"):
+            _write_atomic(_meta_path(path), json.dumps(meta).encode("utf-8"), expires_at)
+        else:
+            _meta_path(path).unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def cached_get(session, url, ttl=None, cache_dir=None, timeout=10):
+    """
+    GET a URL through the on-disk cache.
+
+    Expired entries that carry an ``ETag`` or ``Last-Modified`` validator are
+    revalidated with a conditional request; a ``304 Not Modified`` answer
+    renews the cached body instead of downloading it again. Responses marked
+    ``no-cache`` are stored only when they have a validator, and are then
+    revalidated on every use.
+
+    Args:
+        session (requests.Session): Session used on a cache miss
+        url (str): Request URL
+        ttl (int): Lifetime for a newly cached response in seconds
+                   (default: derived from Cache-Control/Expires headers)
+        cache_dir (Path): Cache directory (default: CACHE_DIR)
+        timeout (int): Request timeout in seconds
+
+    Returns:
+        bytes: Response body, or None if the server answered with an error status
+
+    Raises:
+        requests.RequestException: If the request fails on a cache miss
+    """
+    # Imported here so that importing the cache helpers doesn't load requests
+    from fairbio.utils.http import response_failed
+
+    content = read_cache(url, cache_dir)
+    if content is not None:
+        return content
+
+    meta = read_meta(url, cache_dir)
+    validators = read_validators(url, cache_dir, meta)
+    response = session.get(url, timeout=timeout, headers=validators)
+    content = None
+    if response.status_code == 304 and validators:
+        try:
+            content = cache_path(url, cache_dir).read_bytes()
+        except OSError:
+            # The body vanished since the validators were read; fetch it again
+            response = session.get(url, timeout=timeout)
+    if content is None:
+        if response_failed(response):
+            return None
+        content = response.content
+
+    headers = response.headers
+    if response.status_code == 304:
+        # A 304 need not repeat the validators or caching headers; keep the
+        # ones already stored unless it sends fresh ones
+        fresh = headers.get("Cache-Control") or headers.get("Expires")
+        headers = {
+            "Cache-Control": headers.get("Cache-Control") if fresh else meta.get("cache_control"),
+            "Expires": headers.get("Expires") if fresh else meta.get("expires"),
+            "ETag": headers.get("ETag") or validators.get("If-None-Match"),
+            "Last-Modified": headers.get("Last-Modified") or validators.get("If-Modified-Since"),
+        }
+    if "no-store" in (headers.get("Cache-Control") or "").lower():
+        return content
+    if ttl is None:
+        ttl = ttl_from_headers(headers)
+    if ttl > 0 or headers.get("ETag") or headers.get("Last-Modified"):
+        write_cache(url, content, ttl, cache_dir, headers=headers)
+    return content
+
+
+class MemoCache(object):
+    """Bounded, thread-safe in-process cache that evicts its oldest entry first."""
+    
+    def __init__(self, maxsize=MEMO_SIZE):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            maxsize (int): Maximum number of entries kept (default: MEMO_SIZE)
+        """
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, key, default=None):
+        """
+        Look up a cached value.
+        
+        Args:
+            key (Hashable): Cache key
+            default: Value returned on a miss
+        
+        Returns:
+            Cached value, or ``default`` on a miss
+        """
+        return self._entries.get(key, default)
+    
+    def put(self, key, value):
+        """
+        Store a value, evicting the oldest entry when the cache is full.
+        
+        Args:
+            key (Hashable): Cache key
+            value: Value to store
+        
+        Returns:
+            The stored value
+        """
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                # Dicts keep insertion order, so the first key is the oldest
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = value
+        return value
+    
+    def discard(self, predicate=None):
+        """
+        Remove entries whose key matches a predicate.
+        
+        Args:
+            predicate (callable): Function called with each key (default: remove everything)
+        """
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if predicate(key)]:
+                    del self._entries[key]
@@ -0,0 +1,263 @@
+"""
+HTTP session helpers
+
+Builds ``requests`` sessions with connection pooling and automatic retries so
+that registry clients can share keep-alive connections across requests. When
+``httpx`` with HTTP/2 support is installed, an HTTP/2 client with the same
+``get()`` interface is also available.
+
+Both kinds of client request compressed responses (``gzip, deflate``, plus
+``br`` when a Brotli decoder is installed) and decode them transparently, ask
+for JSON, and identify themselves with a ``fairbio/<version>`` User-Agent.
+"""
+
+import logging
+import sys
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+
+from fairbio import __version__
+
+logger = logging.getLogger(__name__)
+
+# Transient server responses worth retrying
+RETRY_STATUSES = (429, 502, 503, 504)
+
+USER_AGENT = "fairbio/{0}".format(__version__)
+
+# Headers sent by the JSON clients; Accept-Encoding is negotiated by the clients
+# themselves, including br when a Brotli decoder is installed
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": USER_AGENT,
+}
+
+# Exceptions raised by the requests sessions created here; see request_errors()
+# for the ones an HTTP/2 client raises
+REQUEST_ERRORS = (requests.RequestException,)
+
+
+def request_errors(session):
+    """
+    Get the exceptions a client raises when a request fails.
+
+    httpx is only imported once an HTTP/2 client has been created, so this
+    never loads it for a plain requests session.
+
+    Args:
+        session (requests.Session or httpx.Client): Client sending the requests
+
+    Returns:
+        tuple: Exception classes to catch
+    """
+    httpx = sys.modules.get("httpx")
+    if httpx is not None and isinstance(session, httpx.Client):
+        return REQUEST_ERRORS + (httpx.HTTPError,)
+    return REQUEST_ERRORS
+
+
+def response_failed(response):
+    """
+    Check whether a response has an error status, without raising.
+
+    Endpoint lookups treat an error status as "no result" rather than an
+    exception. 404s are expected when probing for tools, versions or
+    descriptors, so they are only logged at debug level; other error
+    statuses are logged as warnings.
+
+    Args:
+        response (requests.Response or httpx.Response): Response to check
+
+    Returns:
+        bool: True if the status code is 400 or above
+    """
+    status = response.status_code
+    if status < 400:
+        return False
+    logger.log(logging.DEBUG if status == 404 else logging.WARNING,
+               "HTTP %s for url: %s", status, response.url)
+    return True
+
+
+def retry_delay(attempt, retry_after=None, backoff_factor=0.3):
+    """
+    Get how long to wait before retrying a request, for clients without a Retry policy.
+
+    A ``Retry-After`` header is honoured as the sessions' policy does;
+    otherwise the delay grows exponentially.
+
+    Args:
+        attempt (int): Number of retries already made
+        retry_after (str): Retry-After header of the failed response
+        backoff_factor (float): Exponential backoff factor between retries
+
+    Returns:
+        float: Delay in seconds
+    """
+    if retry_after:
+        try:
+            return Retry().parse_retry_after(retry_after)
+        except InvalidHeader:
+            pass
+    return backoff_factor * (2 ** attempt)
+
+
+def create_session(pool_connections=32, pool_maxsize=64, retries=3, backoff_factor=0.3):
+    """
+    Create a pooled HTTP session that retries transient failures.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to keep
+        pool_maxsize (int): Maximum connections kept alive per host
+        retries (int): Maximum retries per request
+        backoff_factor (float): Exponential backoff factor between retries
+
+    Returns:
+        requests.Session: Configured session
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False
+        )
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_shared_session = None
+
+
+def get_session():
+    """
+    Get the process-wide pooled session, creating it on first use.
+
+    Registry clients default to this session so that keep-alive connections
+    are reused across every client and request in a CLI run.
+
+    Returns:
+        requests.Session: Shared session
+    """
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session()
+    return _shared_session
+
+
+def create_http2_client(max_keepalive_connections=16, max_connections=32, retries=3):
+    """
+    Create an HTTP/2 client that multiplexes requests over one connection per host.
+
+    Unlike :func:`create_session`, only failed connection attempts are retried;
+    429 and 5xx responses are returned as-is.
+
+    Args:
+        max_keepalive_connections (int): Maximum idle connections kept alive
+        max_connections (int): Maximum concurrent connections
+        retries (int): Retries for failed connection attempts
+
+    Returns:
+        httpx.Client: Configured client, or None if ``httpx[http2]`` is not installed
+    """
+    # Imported here so that HTTP/1.1 users never pay for loading httpx
+    try:
+        import httpx
+        import h2  # noqa: F401 -- required by httpx for http2=True
+    except ImportError:
+        return None
+    transport = httpx.HTTPTransport(
+        http2=True,
+        retries=retries,
+        limits=httpx.Limits(
+            max_keepalive_connections=max_keepalive_connections,
+            max_connections=max_connections
+        )
+    )
+    return httpx.Client(transport=transport, headers=DEFAULT_HEADERS, follow_redirects=True)
+
+
+_shared_http2_client = None
+
+
+def get_http2_client():
+    """
+    Get the process-wide HTTP/2 client, creating it on first use.
+
+    Returns:
+        httpx.Client: Shared client, or None if ``httpx[http2]`` is not installed
+    """
+    global _shared_http2_client
+    if _shared_http2_client is None:
+        _shared_http2_client = create_http2_client()
+    return _shared_http2_client
+
+
+@contextmanager
+def stream_response(session, url, params=None, headers=None, timeout=10, chunk_size=1 << 16):
+    """
+    GET a URL and iterate over its body, keeping the response headers.
+
+    Works with both ``requests`` sessions and ``httpx`` clients. Use this
+    instead of :func:`stream_get` when the headers matter, e.g. to follow
+    pagination links.
+
+    Args:
+        session (requests.Session or httpx.Client): Client to send the request with
+        url (str): Request URL
+        params (dict): Query parameters
+        headers (dict): Extra request headers, overriding the client's defaults
+        timeout (int): Request timeout in seconds
+        chunk_size (int): Size of each yielded chunk in bytes
+
+    Yields:
+        tuple: (headers, chunks) -- the case-insensitive response headers and
+            an iterator over the body chunks
+
+    Raises:
+        REQUEST_ERRORS: If the request fails
+    """
+    if isinstance(session, requests.Session):
+        with session.get(url, params=params, headers=headers, timeout=timeout,
+                         stream=True) as response:
+            response.raise_for_status()
+            yield response.headers, response.iter_content(chunk_size)
+    else:
+        with session.stream("GET", url, params=params, headers=headers, timeout=timeout) as response:
+            response.raise_for_status()
+            yield response.headers, response.iter_bytes(chunk_size)
+
+
+@contextmanager
+def stream_get(session, url, params=None, headers=None, timeout=10, chunk_size=1 << 16):
+    """
+    GET a URL and iterate over its body without loading it into memory.
+
+    Works with both ``requests`` sessions and ``httpx`` clients.
+
+    Args:
+        session (requests.Session or httpx.Client): Client to send the request with
+        url (str): Request URL
+        params (dict): Query parameters
+        headers (dict): Extra request headers, overriding the client's defaults
+        timeout (int): Request timeout in seconds
+        chunk_size (int): Size of each yielded chunk in bytes
+
+    Yields:
+        Iterator[bytes]: Body chunks
+
+    Raises:
+        REQUEST_ERRORS: If the request fails
+    """
+    with stream_response(session, url, params, headers, timeout, chunk_size) as (_, chunks):
+        yield chunks
@@ -0,0 +1,98 @@
+"""
+JSON parsing
+
+Decodes response bodies with orjson when it is installed and falls back to the
+stdlib json module otherwise. Parsing the raw bytes directly also skips the
+text decoding step of ``Response.json()``. Large arrays can be parsed
+incrementally with ijson, one element at a time.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def parse_json(content):
+    """
+    Parse a JSON document.
+
+    Args:
+        content (bytes or str): JSON text, typically a raw response body
+
+    Returns:
+        object: Parsed value (dict, list, ...)
+
+    Raises:
+        ValueError: If the content is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def iter_json_items(chunks, prefix="item"):
+    """
+    Yield the elements of a JSON array as its body arrives.
+
+    With ijson installed, each element is yielded as soon as it has been
+    parsed, so the whole document is never held in memory. Without it the
+    body is collected and parsed with parse_json().
+
+    Args:
+        chunks (Iterable[bytes]): Body chunks, e.g. from fairbio.utils.http.stream_get()
+        prefix (str): ijson path of the elements ('item' for a top-level array)
+
+    Yields:
+        object: Array elements
+
+    Raises:
+        ValueError: If the content is not valid JSON or has no array at ``prefix``
+    """
+    if ijson is None:
+        data = parse_json(b"".join(chunks))
+        try:
+            for key in prefix.split(".")[:-1]:
+                data = data[key]
+        except (KeyError, TypeError):
+            data = None
+        if not isinstance(data, list):
+            raise ValueError("Expected a JSON array at {0!r}".format(prefix))
+        yield from data
+        return
+
+    # The array's own path; its first parse event tells whether it is an array.
+    # The event parser is only fed until that event has been seen.
+    parent = prefix.rpartition(".")[0]
+    events = ijson.sendable_list()
+    checker = ijson.parse_coro(events, use_float=True)
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, prefix, use_float=True)
+    try:
+        for chunk in chunks:
+            if checker is not None:
+                checker.send(chunk)
+                for path, event, _ in events:
+                    if path == parent:
+                        if event != "start_array":
+                            raise ValueError("Expected a JSON array at {0!r}".format(prefix))
+                        checker = None
+                        break
+                del events[:]
+            parser.send(chunk)
+            yield from items
+            del items[:]
+        parser.close()
+    except ijson.JSONError as e:
+        # Report malformed input the same way parse_json() does
+        raise ValueError(str(e)) from e
+    if checker is not None:
+        raise ValueError("Expected a JSON array at {0!r}".format(prefix))
+    yield from items
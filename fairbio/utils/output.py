@@ -0,0 +1,208 @@
+"""
+Output serialization
+
+Writes command results to files (or stdout) as JSON or text. Serializes with
+orjson when it is installed and falls back to the stdlib json module otherwise.
+"""
+
+import sys
+import json
+import contextlib
+import dataclasses
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Write buffer for output files, so multi-MB dumps go out in few syscalls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def _open_output(output_file: str, mode: str):
+    """Open an output file with a large write buffer, or stdout for '-'."""
+    if output_file == '-':
+        if 'b' not in mode:
+            return contextlib.nullcontext(sys.stdout)
+        # Push any pending text out first so it is not reordered after the bytes
+        sys.stdout.flush()
+        try:
+            fd = sys.stdout.fileno()
+        except (AttributeError, OSError):
+            # Replaced stdout (e.g. captured output) without a real descriptor
+            return contextlib.nullcontext(sys.stdout.buffer)
+        # Same large buffer as for files; closefd=False leaves stdout open
+        return open(fd, mode, buffering=OUTPUT_BUFFER_SIZE, closefd=False)
+    if 'b' in mode:
+        return open(output_file, mode, buffering=OUTPUT_BUFFER_SIZE)
+    return open(output_file, mode, encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE)
+
+
+def _end_stdout_line(f, output_file: str, newline):
+    """End the document with a newline when writing to stdout, as print() would."""
+    if output_file == '-':
+        f.write(newline)
+
+
+def _to_serializable(obj):
+    """Convert objects the JSON encoders do not handle natively (e.g. pydantic models)."""
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, '__dict__'):
+        return vars(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_dumps(data, option=0):
+    """Serialize with orjson, handling dataclasses and numpy values natively.
+
+    Non-str dict keys are turned into strings, as the stdlib json module does.
+    """
+    return orjson.dumps(
+        data,
+        default=_to_serializable,
+        option=(option | orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_NON_STR_KEYS)
+    )
+
+
+def _orjson_key(key):
+    """Encode a dict key as a JSON string, coercing int, float, bool and None like json.dump()."""
+    if not isinstance(key, str):
+        if key is not None and not isinstance(key, (int, float)):
+            raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+        key = json.dumps(key)
+    return orjson.dumps(key)
+
+
+def _write_list_orjson(f, data):
+    """Write one line per list item (JSON Lines); dicts as compact JSON."""
+    dumps = orjson.dumps
+    option = orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    f.writelines(
+        (dumps(item, default=_to_serializable, option=option)
+         if isinstance(item, dict) else str(item).encode()) + b"\n"
+        for item in data
+    )
+
+
+def _write_list_json(f, data):
+    """Write one line per list item (JSON Lines); dicts as compact JSON."""
+    # json.dumps() builds a new encoder per call when given options; reuse one
+    encode = json.JSONEncoder(default=_to_serializable).encode
+    f.writelines(
+        (encode(item) if isinstance(item, dict) else str(item)) + "\n"
+        for item in data
+    )
+
+
+def _write_indented_orjson(f, data, indent=b""):
+    """Write indented JSON, encoding list elements one at a time.
+
+    Output is identical to ``orjson.dumps(data, option=OPT_INDENT_2 | OPT_NON_STR_KEYS)``
+    but the top-level document and its list values are streamed, so peak memory is
+    bounded by the largest single element rather than the whole payload.
+    """
+    if type(data) is dict and data:
+        f.write(b"{")
+        separator = b"\n"
+        for key, value in data.items():
+            f.write(separator + indent + b"  " + _orjson_key(key) + b": ")
+            _write_indented_orjson(f, value, indent + b"  ")
+            separator = b",\n"
+        f.write(b"\n" + indent + b"}")
+    elif type(data) is list and data:
+        newline = b"\n" + indent + b"  "
+        f.write(b"[")
+        separator = b"\n"
+        for item in data:
+            f.write(separator + indent + b"  ")
+            f.write(_orjson_dumps(item, orjson.OPT_INDENT_2).replace(b"\n", newline))
+            separator = b",\n"
+        f.write(b"\n" + indent + b"]")
+    else:
+        f.write(_orjson_dumps(data, orjson.OPT_INDENT_2).replace(b"\n", b"\n" + indent))
+
+
+def _write_indented_json(f, data):
+    """Write indented JSON chunk by chunk."""
+    for chunk in json.JSONEncoder(indent=2, default=_to_serializable).iterencode(data):
+        f.write(chunk)
+
+
+# Text-format writers keyed by the exact type of the data being saved
+_TEXT_WRITERS_ORJSON = {
+    dict: _write_indented_orjson,
+    list: _write_list_orjson,
+}
+_TEXT_WRITERS_JSON = {
+    dict: _write_indented_json,
+    list: _write_list_json,
+}
+
+
+def save_output(data, output_file: str, format: str = "json"):
+    """Save output to file in specified format.
+
+    Serializes with orjson when it is installed, otherwise falls back to the
+    stdlib json module. Output is written as it is encoded rather than being
+    assembled into one large string first.
+    """
+    if orjson is None:
+        _save_output_json(data, output_file, format)
+        return
+
+    if format == "json":
+        with _open_output(output_file, 'wb') as f:
+            _write_indented_orjson(f, data)
+            _end_stdout_line(f, output_file, b"\n")
+    elif format == "text":
+        writer = _TEXT_WRITERS_ORJSON.get(type(data), lambda f, d: f.write(str(d).encode()))
+        with _open_output(output_file, 'wb') as f:
+            writer(f, data)
+            # JSON Lines output already ends with a newline
+            if writer is not _write_list_orjson:
+                _end_stdout_line(f, output_file, b"\n")
+
+
+def save_output_raw(data: dict, raw_key: str, raw: bytes, output_file: str):
+    """Save a JSON document whose ``raw_key`` value is already-encoded JSON.
+
+    The other top-level fields of ``data`` are encoded normally; ``raw`` is
+    written verbatim as the last field instead of ``data[raw_key]``.
+    """
+    with _open_output(output_file, 'wb') as f:
+        f.write(b"{\n")
+        for key, value in data.items():
+            if key != raw_key:
+                f.write("  {0}: {1},\n".format(
+                    json.dumps(key), json.dumps(value, default=_to_serializable)).encode())
+        f.write("  {0}: ".format(json.dumps(raw_key)).encode())
+        f.write(raw.strip())
+        f.write(b"\n}")
+        _end_stdout_line(f, output_file, b"\n")
+
+
+def _save_output_json(data, output_file: str, format: str = "json"):
+    """Save output to file using the stdlib json module."""
+    if format == "json":
+        with _open_output(output_file, 'w') as f:
+            _write_indented_json(f, data)
+            _end_stdout_line(f, output_file, "\n")
+    elif format == "text":
+        writer = _TEXT_WRITERS_JSON.get(type(data), lambda f, d: f.write(str(d)))
+        with _open_output(output_file, 'w') as f:
+            writer(f, data)
+            # JSON Lines output already ends with a newline
+            if writer is not _write_list_json:
+                _end_stdout_line(f, output_file, "\n")
+
+
+def print_json(data):
+    """Print data as indented JSON to stdout."""
+    save_output(data, '-', "json")